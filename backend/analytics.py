@@ -0,0 +1,103 @@
+from collections import defaultdict
+
+from sqlalchemy import bindparam, insert, update
+
+# Counters kept per (day, item) and per (day, employee)
+REQUEST_COUNTERS = ('requests', 'requested_qty', 'approvals', 'approved_qty', 'rejections')
+# Counters kept per (day, supplier); lead time is summed so averages stay additive
+SUPPLIER_COUNTERS = ('orders_placed', 'deliveries', 'delivered_qty', 'lead_seconds')
+
+
+def request_increments(event_type, quantity):
+    if event_type == 'request.created':
+        return {'requests': 1, 'requested_qty': quantity}
+    if event_type == 'request.approved':
+        return {'approvals': 1, 'approved_qty': quantity}
+    if event_type == 'request.rejected':
+        return {'rejections': 1}
+    return None
+
+
+def aggregate_events(events, day):
+    # Fold change events into rollup increments: returns (per item, per
+    # employee, per supplier) row lists. Events may carry their own 'day'
+    # (used by rebuilds); otherwise they count towards `day`.
+    by_item = defaultdict(lambda: dict.fromkeys(REQUEST_COUNTERS, 0))
+    by_employee = defaultdict(lambda: dict.fromkeys(REQUEST_COUNTERS, 0))
+    by_supplier = defaultdict(lambda: dict.fromkeys(SUPPLIER_COUNTERS, 0))
+
+    for event in events:
+        payload = event['payload']
+        event_type = event['event_type']
+        event_day = event.get('day', day)
+        if event_type.startswith('request.'):
+            increments = request_increments(event_type, payload.get('quantity') or 0)
+            if not increments:
+                continue
+            for target in (by_item[event_day, payload['item_id']], by_employee[event_day, event['user_id']]):
+                for name, value in increments.items():
+                    target[name] += value
+        elif event_type == 'supplier_order.created':
+            by_supplier[event_day, event['user_id']]['orders_placed'] += 1
+        elif event_type == 'supplier_order.delivered':
+            counters = by_supplier[event_day, event['user_id']]
+            counters['deliveries'] += 1
+            counters['delivered_qty'] += payload.get('quantity') or 0
+            counters['lead_seconds'] += payload.get('lead_seconds') or 0
+
+    return (
+        [dict(counters, day=key[0], item_id=key[1]) for key, counters in by_item.items()],
+        [dict(counters, day=key[0], employee_id=key[1]) for key, counters in by_employee.items()],
+        [dict(counters, day=key[0], supplier_id=key[1]) for key, counters in by_supplier.items()]
+    )
+
+
+def upsert_increments(session, table, keys, counters, rows):
+    # Add counters onto existing rollup rows, creating the missing ones.
+    # MySQL and SQLite do it in one statement; elsewhere update then insert.
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        statement = mysql_insert(table)
+        session.execute(statement.on_duplicate_key_update(
+            {name: table.c[name] + statement.inserted[name] for name in counters}
+        ), rows)
+        return
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        statement = sqlite_insert(table)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[table.c[key] for key in keys],
+            set_={name: table.c[name] + statement.excluded[name] for name in counters}
+        ), rows)
+        return
+
+    statement = update(table).values({name: table.c[name] + bindparam(f'd_{name}') for name in counters})
+    for key in keys:
+        statement = statement.where(table.c[key] == bindparam(f'k_{key}'))
+    missing = []
+    for row in rows:
+        params = {f'd_{name}': row[name] for name in counters}
+        params.update({f'k_{key}': row[key] for key in keys})
+        if session.execute(statement, params).rowcount == 0:
+            missing.append(row)
+    if missing:
+        session.execute(insert(table), missing)
+
+
+def bucket_series(rows, bucket):
+    # rows: (day, value) pairs ordered by day; month buckets are summed here
+    # from the daily rows so the query stays a plain GROUP BY day
+    if bucket == 'day':
+        return [{'period': day.isoformat(), 'value': int(value or 0)} for day, value in rows]
+    series = []
+    for day, value in rows:
+        period = day.strftime('%Y-%m')
+        if series and series[-1]['period'] == period:
+            series[-1]['value'] += int(value or 0)
+        else:
+            series.append({'period': period, 'value': int(value or 0)})
+    return series
@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+
+from sqlalchemy import insert
+
+# session.info key holding audit rows for the current transaction; they are
+# handed to the writer only after the commit succeeds.
+PENDING_AUDIT = 'pending_audit_rows'
+
+_STOP = object()
+
+
+def queue_audit(session, table, row):
+    session.info.setdefault(PENDING_AUDIT, []).append((table, row))
+
+
+def pop_audit(session):
+    return session.info.pop(PENDING_AUDIT, [])
+
+
+class AuditWriter:
+    """Background thread that writes audit rows in multi-row INSERTs.
+
+    Rows are flushed when ``batch_size`` have queued up or ``max_latency``
+    seconds after the first one arrived, whichever comes first. When the
+    queue is full, producers wait up to ``put_timeout`` seconds and then
+    the row is dropped and counted, so a slow database never stalls
+    request handlers for long.
+    """
+
+    def __init__(self, engine, batch_size=500, max_latency=0.5, max_queue=10000, put_timeout=0.1):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed_batches = 0
+        self.batches = 0
+        self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+        self._thread.start()
+
+    def enqueue(self, items):
+        accepted = 0
+        for item in items:
+            try:
+                self._queue.put(item, timeout=self.put_timeout)
+                accepted += 1
+            except queue.Full:
+                with self._lock:
+                    self.dropped += len(items) - accepted
+                print(f"Audit queue full; dropped {len(items) - accepted} rows")
+                break
+        with self._lock:
+            self.enqueued += accepted
+
+    def _collect(self):
+        # Block for the first row, then gather more until the batch is full or
+        # the latency budget is spent. Returns (batch, stop requested).
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write(self, batch):
+        by_table = {}
+        for table, row in batch:
+            by_table.setdefault(table, []).append(row)
+        for attempt in range(2):
+            try:
+                with self.engine.begin() as connection:
+                    for table, rows in by_table.items():
+                        connection.execute(insert(table), rows)
+                with self._lock:
+                    self.written += len(batch)
+                    self.batches += 1
+                return
+            except Exception as e:
+                print(f"Audit batch of {len(batch)} rows failed (attempt {attempt + 1}): {e}")
+                time.sleep(0.5)
+        with self._lock:
+            self.failed_batches += 1
+            self.dropped += len(batch)
+
+    def _run(self):
+        while True:
+            batch, stop = self._collect()
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def close(self, timeout=5):
+        # Flush what is queued and stop the thread (called at interpreter exit)
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'enqueued': self.enqueued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'batches': self.batches,
+                'failed_batches': self.failed_batches
+            }
@@ -0,0 +1,57 @@
+import json
+import threading
+
+# session.info key holding events queued by the current transaction; they are
+# written in the same commit as the change they describe, so a client never
+# sees an event for a write that was rolled back.
+PENDING_EVENTS = 'pending_change_events'
+
+
+def queue_event(session, event_type, payload, user_id=None, audience='admin'):
+    # audience: 'all', or the role that sees the event; user_id also sees it
+    session.info.setdefault(PENDING_EVENTS, []).append({
+        'event_type': event_type,
+        'audience': audience,
+        'user_id': user_id,
+        'payload': payload
+    })
+
+
+def pop_events(session):
+    return session.info.pop(PENDING_EVENTS, [])
+
+
+def visible_to(event, role, user_id):
+    return role == 'admin' or event.user_id == user_id or event.audience in ('all', role)
+
+
+def encode_payload(payload):
+    return json.dumps(payload, default=str)
+
+
+def format_event(event_id, event_type, data):
+    # data is already JSON text
+    return f'id: {event_id}\nevent: {event_type}\ndata: {data}\n\n'
+
+
+class ChangeNotifier:
+    # Wakes this worker's open streams as soon as a commit writes events;
+    # streams also poll on a timer to pick up events from other workers.
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._sequence = 0
+
+    def notify(self):
+        with self._condition:
+            self._sequence += 1
+            self._condition.notify_all()
+
+    def sequence(self):
+        return self._sequence
+
+    def wait(self, seen, timeout):
+        # Returns once the sequence moves past `seen` or the timeout expires
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence != seen, timeout)
+            return self._sequence
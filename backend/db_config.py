@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+
+def env_flag(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def is_memory_sqlite(uri):
+    return uri.startswith('sqlite') and (uri in ('sqlite://', 'sqlite:///') or ':memory:' in uri)
+
+
+def resolve_database_uri(default_uri, sqlite_path):
+    # DATABASE_URL wins; with DATABASE_FALLBACK_SQLITE set, an unreachable
+    # server (or a missing driver) drops back to the local SQLite file.
+    uri = os.environ.get('DATABASE_URL', default_uri)
+    if uri.startswith('sqlite') or not env_flag('DATABASE_FALLBACK_SQLITE'):
+        return uri
+
+    try:
+        engine = create_engine(uri, connect_args={'connect_timeout': 3})
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+        engine.dispose()
+        return uri
+    except Exception as e:
+        print(f"Database unavailable ({e.__class__.__name__}: {e}); falling back to SQLite at {sqlite_path}")
+        return f'sqlite:///{sqlite_path}'
+
+
+class PoolMetrics:
+    # Counters for one worker process; fed by InstrumentedQueuePool and pool events
+
+    def __init__(self):
+        self.checkouts = 0
+        self.connects = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.connect_errors = 0
+        self.invalidations = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.pool = None
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds, timed_out=False, failed=False):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+            elif failed:
+                # Connect errors, database down: not the pool running dry
+                self.connect_errors += 1
+
+    def attach(self, pool):
+        self.pool = pool
+
+        @event.listens_for(pool, 'connect')
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connects += 1
+                # Connections beyond pool_size come out of max_overflow
+                if hasattr(pool, 'overflow') and pool.overflow() > 0:
+                    self.overflow_events += 1
+
+        @event.listens_for(pool, 'checkout')
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+
+        @event.listens_for(pool, 'invalidate')
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+    def snapshot(self):
+        pool = self.pool
+        with self._lock:
+            data = {
+                'pid': os.getpid(),
+                'checkouts': self.checkouts,
+                'connects': self.connects,
+                'overflow_events': self.overflow_events,
+                'timeouts': self.timeouts,
+                'connect_errors': self.connect_errors,
+                'invalidations': self.invalidations,
+                'wait_count': self.wait_count,
+                'wait_avg_ms': round(self.wait_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000, 3)
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0)
+            })
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    # Times how long callers wait for a connection, including pool timeouts
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeout:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        except Exception:
+            pool_metrics.record_wait(time.perf_counter() - start, failed=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+def engine_options(uri):
+    # Pool sizing comes from the environment; in-memory SQLite keeps its own pool
+    if is_memory_sqlite(uri):
+        return {}
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        # Recycle before MySQL/proxy idle timeouts close the socket under us
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        # Cheap liveness check on checkout avoids "MySQL server has gone away"
+        'pool_pre_ping': env_flag('DB_POOL_PRE_PING', True)
+    }
@@ -0,0 +1,48 @@
+import csv
+import tempfile
+from io import StringIO
+
+CSV_CHUNK_ROWS = 500
+XLSX_CHUNK_BYTES = 64 * 1024
+# Finished workbooks larger than this spill from memory to a temp file
+XLSX_SPOOL_BYTES = 4 * 1024 * 1024
+
+
+def csv_stream(header, rows, chunk_rows=CSV_CHUNK_ROWS):
+    # Yield the CSV a few hundred rows at a time so only one chunk is ever held in memory
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+
+    yield buffer.getvalue()
+
+
+def xlsx_stream(sheet_name, header, rows, chunk_bytes=XLSX_CHUNK_BYTES):
+    # openpyxl's write-only mode spools rows to disk as they are appended,
+    # so the workbook never exists as a full object tree in memory.
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(header)
+    for row in rows:
+        sheet.append(list(row))
+
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES) as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(chunk_bytes)
+            if not chunk:
+                break
+            yield chunk
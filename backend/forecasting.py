@@ -0,0 +1,49 @@
+import numpy as np
+
+# Days of approved-demand history fed into the forecast
+HISTORY_DAYS = 90
+SMA_WINDOW = 28
+EMA_ALPHA = 0.1
+
+
+def demand_matrix(item_ids, rows, start_day, days=HISTORY_DAYS):
+    """Scatter (item_id, day, quantity) rows into an items x days matrix.
+
+    ``item_ids`` must be sorted; rows for unknown items or days outside the
+    window are dropped. float32 keeps 100k items x 90 days around 36 MB.
+    """
+    matrix = np.zeros((len(item_ids), days), dtype=np.float32)
+    if not rows:
+        return matrix
+    ids, day_offsets, quantities = (np.asarray(column) for column in zip(*rows))
+    positions = np.searchsorted(item_ids, ids)
+    positions = np.minimum(positions, len(item_ids) - 1)
+    keep = (item_ids[positions] == ids) & (day_offsets >= 0) & (day_offsets < days)
+    np.add.at(matrix, (positions[keep], day_offsets[keep].astype(np.intp)), quantities[keep])
+    return matrix
+
+
+def forecast_demand(matrix, method='ema', window=SMA_WINDOW, alpha=EMA_ALPHA):
+    # Expected units per day for every item at once; loops run over days, never items
+    if matrix.shape[1] == 0:
+        return np.zeros(matrix.shape[0], dtype=np.float32)
+    if method == 'sma':
+        return matrix[:, -window:].mean(axis=1)
+    level = matrix[:, :window].mean(axis=1)
+    for day in range(window, matrix.shape[1]):
+        level = alpha * matrix[:, day] + (1 - alpha) * level
+    return level
+
+
+def reorder_plan(available, incoming, threshold, daily_demand, lead_days, coverage_days):
+    """Items whose stock position dips below threshold before a new order could land.
+
+    Returns (mask, projected, quantity): the projected position at the end of
+    the lead time, and an order that lifts it back to threshold plus
+    ``coverage_days`` of demand.
+    """
+    position = available + incoming
+    projected = position - daily_demand * lead_days
+    mask = (projected < threshold) & ((daily_demand > 0) | (position < threshold))
+    quantity = np.ceil(threshold + daily_demand * coverage_days - projected)
+    return mask, projected, np.maximum(quantity, 1).astype(np.int64)
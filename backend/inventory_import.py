@@ -0,0 +1,238 @@
+import csv
+import io
+import time
+from datetime import datetime
+
+from sqlalchemy import bindparam, insert, select, update
+
+from stock_ledger import mark_touched
+
+REQUIRED_COLUMNS = {'name', 'description', 'stock', 'low_stock_threshold'}
+CHUNK_SIZE = 1000
+DEFAULT_LOW_STOCK_THRESHOLD = 10
+# Keep the response bounded when a whole sheet is bad; error_count still has the total
+MAX_REPORTED_ERRORS = 1000
+
+
+class InventoryImportError(ValueError):
+    pass
+
+
+def normalise_column(column):
+    # "Low Stock Threshold" -> "low_stock_threshold"
+    return str(column).strip().lower().replace(' ', '_')
+
+
+def iter_sheet_rows(file, filename):
+    # Yield the header row and then data rows one at a time, without
+    # materialising the sheet (read-only openpyxl / csv reader).
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+
+    if extension == 'csv':
+        text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        yield from csv.reader(text)
+    elif extension in ('xlsx', 'xlsm'):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        try:
+            yield from workbook.active.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+    else:
+        # Legacy .xls has no streaming reader; fall back to pandas
+        import pandas as pd
+
+        df = pd.read_excel(file)
+        yield list(df.columns)
+        yield from df.itertuples(index=False, name=None)
+
+
+def _is_blank(value):
+    return value is None or value != value or (isinstance(value, str) and not value.strip())
+
+
+def _parse_count(value, field):
+    if isinstance(value, str):
+        value = value.strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} must be a number')
+    if not number.is_integer() or number < 0:
+        raise ValueError(f'{field} must be a non-negative whole number')
+    return int(number)
+
+
+def parse_row(row):
+    if _is_blank(row.get('name')):
+        raise ValueError('name is required')
+    name = str(row['name']).strip()
+    if len(name) > 100:
+        raise ValueError('name is longer than 100 characters')
+
+    description = row.get('description')
+    description = None if _is_blank(description) else str(description).strip()
+
+    threshold = row.get('low_stock_threshold')
+    return {
+        'name': name,
+        'description': description,
+        'stock': _parse_count(row.get('stock'), 'stock'),
+        'low_stock_threshold': (
+            DEFAULT_LOW_STOCK_THRESHOLD if _is_blank(threshold)
+            else _parse_count(threshold, 'low_stock_threshold')
+        )
+    }
+
+
+class InventoryImport:
+    """Chunked, set-based inventory upsert.
+
+    Each chunk costs one SELECT to find existing items, one executemany
+    UPDATE that adds stock in SQL and one multi-row INSERT for new items,
+    instead of a query and an ORM object per spreadsheet row.
+    """
+
+    def __init__(self, session, model, chunk_size=CHUNK_SIZE, start_after_row=0, on_chunk=None, on_change=None):
+        self.session = session
+        self.model = model
+        self.chunk_size = chunk_size
+        # Rows up to start_after_row were applied by an earlier run and are skipped
+        self.start_after_row = start_after_row
+        # Called as on_chunk(self, last_row) once every row up to last_row has been applied
+        self.on_chunk = on_chunk
+        # Called as on_change(item_id, action, values) for every item inserted
+        # ('INSERT', the new row) or topped up ('UPDATE', the stock added)
+        self.on_change = on_change
+        self.rows_read = 0
+        self.inserted = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []
+        self.started_at = None
+        self.finished_at = None
+
+    def run(self, file, filename):
+        self.started_at = time.perf_counter()
+        rows = iter_sheet_rows(file, filename)
+
+        header = next(rows, None)
+        if header is None:
+            raise InventoryImportError('File is empty')
+        columns = [normalise_column(c) for c in header]
+        missing_columns = REQUIRED_COLUMNS - set(columns)
+        if missing_columns:
+            raise InventoryImportError(f'Missing required columns: {missing_columns}')
+
+        chunk = []
+        row_number = self.start_after_row
+        # Row numbers match the spreadsheet: the header is row 1
+        for row_number, values in enumerate(rows, start=2):
+            if row_number <= self.start_after_row or all(_is_blank(v) for v in values):
+                continue
+            self.rows_read += 1
+            try:
+                chunk.append(parse_row(dict(zip(columns, values))))
+            except ValueError as e:
+                self.add_error(row_number, str(e))
+            if len(chunk) >= self.chunk_size:
+                self.flush(chunk, row_number)
+                chunk = []
+
+        self.flush(chunk, max(row_number, self.start_after_row))
+        self.finished_at = time.perf_counter()
+        return self
+
+    def flush(self, chunk, last_row):
+        if chunk:
+            self.apply_chunk(chunk)
+        if self.on_chunk:
+            self.on_chunk(self, last_row)
+
+    def add_error(self, row_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'error': message})
+
+    def apply_chunk(self, records):
+        model = self.model
+        table = model.__table__
+
+        # Fold repeated (name, description) pairs within the chunk into one change
+        merged = {}
+        for record in records:
+            key = (record['name'], record['description'])
+            if key in merged:
+                merged[key]['stock'] += record['stock']
+            else:
+                merged[key] = dict(record)
+
+        # One lookup per chunk; name is indexed (idx_name_search)
+        existing = {}
+        names = {name for name, _ in merged}
+        for item_id, name, description in self.session.execute(
+            select(model.id, model.name, model.description)
+            .where(model.name.in_(names))
+            .order_by(model.id)
+        ):
+            existing.setdefault((name, description), item_id)
+
+        now = datetime.utcnow()
+        updates = []
+        inserts = []
+        for key, record in merged.items():
+            if key in existing:
+                updates.append({'item_id': existing[key], 'added': record['stock'], 'now': now})
+            else:
+                inserts.append(dict(record, created_at=now, updated_at=now))
+
+        if updates:
+            self.session.execute(
+                update(table)
+                .where(table.c.id == bindparam('item_id'))
+                .values(stock=table.c.stock + bindparam('added'), updated_at=bindparam('now')),
+                updates
+            )
+        if inserts:
+            self.session.execute(insert(table), inserts)
+
+        touched = [u['item_id'] for u in updates]
+        inserted = {}
+        if inserts:
+            # Multi-row INSERT doesn't hand back ids; fetch them for the low-stock refresh
+            new_keys = {(r['name'], r['description']): r for r in inserts}
+            known = set(existing.values())
+            for item_id, name, description in self.session.execute(
+                select(model.id, model.name, model.description).where(model.name.in_({r['name'] for r in inserts}))
+            ):
+                touched.append(item_id)
+                if (name, description) in new_keys and item_id not in known:
+                    inserted[item_id] = new_keys[name, description]
+        mark_touched(self.session, touched)
+
+        if self.on_change:
+            for item_id, record in inserted.items():
+                self.on_change(item_id, 'INSERT', {
+                    'name': record['name'],
+                    'description': record['description'],
+                    'stock': record['stock'],
+                    'low_stock_threshold': record['low_stock_threshold']
+                })
+            for u in updates:
+                self.on_change(u['item_id'], 'UPDATE', {'movement': 'import', 'stock_delta': u['added']})
+
+        self.updated += len(updates)
+        self.inserted += len(inserts)
+
+    def stats(self):
+        end = self.finished_at or time.perf_counter()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        return {
+            'rows_read': self.rows_read,
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'error_count': self.error_count,
+            'elapsed_ms': round(elapsed * 1000, 1),
+            'rows_per_second': round(self.rows_read / elapsed, 1) if elapsed else None
+        }
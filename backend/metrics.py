@@ -0,0 +1,124 @@
+import os
+import threading
+import traceback
+
+# Seconds; Prometheus-style cumulative buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 500)
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f'{name}_sum{{{labels}}} {self.total:.6f}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sql_statements = Histogram(SQL_COUNT_BUCKETS)
+        self.sql_seconds = 0.0
+        self.response_bytes = 0
+
+
+class RequestMetrics:
+    """Per-worker request and SQL counters, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.slow_queries = 0
+        self.sql_total = 0
+        self.sql_seconds_total = 0.0
+
+    def record_request(self, method, endpoint, status, seconds, sql_count, sql_seconds, response_bytes):
+        key = (method, endpoint, str(status))
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats()
+            stats.latency.observe(seconds)
+            stats.sql_statements.observe(sql_count)
+            stats.sql_seconds += sql_seconds
+            stats.response_bytes += response_bytes
+
+    def record_query(self, seconds, slow):
+        with self._lock:
+            self.sql_total += 1
+            self.sql_seconds_total += seconds
+            if slow:
+                self.slow_queries += 1
+
+    def render(self, gauges=None, counters=None):
+        lines = []
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines += [
+                '# HELP http_request_duration_seconds Request latency by endpoint',
+                '# TYPE http_request_duration_seconds histogram'
+            ]
+            for (method, endpoint, status), stats in endpoints:
+                labels = f'method="{method}",endpoint="{escape(endpoint)}",status="{status}"'
+                lines += stats.latency.lines('http_request_duration_seconds', labels)
+            lines += [
+                '# HELP http_request_sql_statements SQL statements issued per request',
+                '# TYPE http_request_sql_statements histogram'
+            ]
+            for (method, endpoint, status), stats in endpoints:
+                labels = f'method="{method}",endpoint="{escape(endpoint)}",status="{status}"'
+                lines += stats.sql_statements.lines('http_request_sql_statements', labels)
+            for name, help_text, attribute in (
+                ('http_request_sql_seconds_total', 'Time spent in SQL per endpoint', 'sql_seconds'),
+                ('http_response_bytes_total', 'Response body bytes per endpoint', 'response_bytes')
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for (method, endpoint, status), stats in endpoints:
+                    labels = f'method="{method}",endpoint="{escape(endpoint)}",status="{status}"'
+                    value = getattr(stats, attribute)
+                    lines.append(f'{name}{{{labels}}} {value:.6f}' if isinstance(value, float) else f'{name}{{{labels}}} {value}')
+            lines += [
+                '# TYPE sql_statements_total counter', f'sql_statements_total {self.sql_total}',
+                '# TYPE sql_seconds_total counter', f'sql_seconds_total {self.sql_seconds_total:.6f}',
+                '# TYPE sql_slow_queries_total counter', f'sql_slow_queries_total {self.slow_queries}'
+            ]
+        for name, value in sorted((counters or {}).items()):
+            lines += [f'# TYPE {name} counter', f'{name} {value}']
+        for name, value in sorted((gauges or {}).items()):
+            lines += [f'# TYPE {name} gauge', f'{name} {value}']
+        return '\n'.join(lines) + '\n'
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def call_site(ignore=()):
+    # Innermost frame in our own code that issued the query, skipping this
+    # module and the named instrumentation functions
+    for frame in reversed(traceback.extract_stack()[:-1]):
+        if frame.name in ignore:
+            continue
+        if frame.filename.startswith(BACKEND_DIR) and not frame.filename.endswith('metrics.py'):
+            return f'{os.path.basename(frame.filename)}:{frame.lineno} in {frame.name}'
+    return 'unknown'
@@ -1,10 +1,18 @@
-from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
-import jwt
 from datetime import datetime, timedelta
 
-db = SQLAlchemy()
+import jwt
+from flask import current_app
+from flask_sqlalchemy import SQLAlchemy
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from replicas import RoutingSession
 
+# The app's only SQLAlchemy instance; create_app() binds it with db.init_app.
+# Its sessions send reads of @replica_reads handlers to read replicas, if any are configured.
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+
+# User Model
 class User(db.Model):
     __tablename__ = 'users'
     id = db.Column(db.Integer, primary_key=True)
@@ -14,11 +22,36 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)  # ✅ Hash password before storing
+        self.password_hash = generate_password_hash(password, method=current_app.config['PASSWORD_HASH_METHOD'])
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)  # ✅ Compare hashes
+        return check_password_hash(self.password_hash, password)
+
+    def generate_token(self):
+        token = jwt.encode(
+            {'id': self.id, 'role': self.role, 'username': self.username,
+             'exp': datetime.utcnow() + timedelta(minutes=current_app.config['ACCESS_TOKEN_MINUTES'])},
+            current_app.config['SECRET_KEY'],
+            algorithm='HS256'
+        )
+        return token
+
 
+# Refresh tokens are opaque random strings; only their sha256 is stored.
+# Each one is single use: refreshing revokes it and issues its replacement.
+class RefreshToken(db.Model):
+    __tablename__ = 'refresh_tokens'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    token_hash = db.Column(db.String(64), unique=True, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    revoked_at = db.Column(db.DateTime)
+    # Set when the token was spent on a refresh: the token issued in its place
+    replaced_by_id = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# Inventory Model
 class Inventory(db.Model):
     __table_args__ = (
         db.Index('idx_name_search', 'name'),  # For faster searching
@@ -29,41 +62,118 @@ class Inventory(db.Model):
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     stock = db.Column(db.Integer, nullable=False)
+    # Units held for pending requests; available = stock - reserved
+    reserved = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     low_stock_threshold = db.Column(db.Integer, default=10)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-# Update your EmployeeRequest model to include relationships:
+
+class AuditLog(db.Model):
+    
+    __tablename__ = 'audit_logs'
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50))
+    record_id = db.Column(db.Integer)
+    action = db.Column(db.String(10))  # INSERT/UPDATE/DELETE
+    old_values = db.Column(db.JSON)
+    new_values = db.Column(db.JSON)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+
 
 class EmployeeRequest(db.Model):
     __table_args__ = (
         db.Index('idx_request_status', 'status'),  # Faster status filtering
         db.Index('idx_employee_items', 'employee_id', 'item_id'),  # For user-item analysis
+        db.Index('idx_request_status_created', 'status', 'created_at'),  # For archiving
     )
-    __tablename__ = 'employee_requests'
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    item_id = db.Column(db.Integer, db.ForeignKey('inventory.id'), nullable=False)  # ✅ Fixed
     quantity = db.Column(db.Integer, nullable=False)
-    reason = db.Column(db.Text)
+    reason = db.Column(db.Text, nullable=True)
     status = db.Column(db.Enum('pending', 'approved', 'rejected'), default='pending')
-    admin_response = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    admin_response = db.Column(db.Text, nullable=True)
+    # Stock reserved at submit time; 0 once approved/rejected (or for older requests)
+    reserved_quantity = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Set when the request was one line of a multi-item cart submission
+    cart_id = db.Column(db.String(32), db.ForeignKey('request_carts.id', ondelete='SET NULL'), nullable=True, index=True)
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
 
-    # 🔹 Keep only the employee relationship
-    employee = db.relationship('User', backref='requests')
+    employee = db.relationship('User', backref=db.backref('requests', lazy=True))
+    item = db.relationship('Inventory', backref=db.backref('requests', lazy=True))  # ✅ Fixed
 
-    # ❌ REMOVE this line since there's no item_id anymore
-    # item = db.relationship('Inventory', backref='requests')
 
 class SupplierOrder(db.Model):
-    __tablename__ = 'supplier_orders'
+    __table_args__ = (
+        db.Index('idx_supplier_order_status_created', 'status', 'created_at'),  # For archiving
+    )
     id = db.Column(db.Integer, primary_key=True)
     item_id = db.Column(db.Integer, db.ForeignKey('inventory.id'), nullable=False)
     quantity = db.Column(db.Integer, nullable=False)
     supplier_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    status = db.Column(db.Enum('pending', 'shipped', 'delivered'), default='pending')
+    status = db.Column(db.String(20), default='pending')
+    # Shared by the orders created in one POST /supplier-orders/batch call
+    batch_id = db.Column(db.String(32), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    item = db.relationship('Inventory', backref=db.backref('supplier_orders', lazy='dynamic'))
+
+
+class RequestCart(db.Model):
+    # One multi-item submission; its lines are the employee_requests rows with
+    # this cart_id. A retry sent with the same Idempotency-Key maps back to it.
+    __tablename__ = 'request_carts'
+    __table_args__ = (
+        db.UniqueConstraint('employee_id', 'idempotency_key', name='uq_cart_idempotency_key'),
+    )
+    id = db.Column(db.String(32), primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    idempotency_key = db.Column(db.String(100), nullable=True)
+    # sha256 of the submitted lines, so a reused key with a different cart is refused
+    request_hash = db.Column(db.String(64), nullable=False)
+    line_count = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# Archive storage: same columns as the hot tables plus archived_at, no foreign
+# keys so old rows never block user/item deletes (see archive_closed_rows)
+class EmployeeRequestArchive(db.Model):
+    __tablename__ = 'employee_request_archive'
+    __table_args__ = (
+        db.Index('idx_request_archive_created', 'created_at'),
+        db.Index('idx_request_archive_employee', 'employee_id'),
+    )
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    employee_id = db.Column(db.Integer, nullable=False)
+    item_id = db.Column(db.Integer, nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    reason = db.Column(db.Text, nullable=True)
+    status = db.Column(db.String(20))
+    admin_response = db.Column(db.Text, nullable=True)
+    reserved_quantity = db.Column(db.Integer, nullable=False, default=0)
+    cart_id = db.Column(db.String(32), nullable=True)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class SupplierOrderArchive(db.Model):
+    __tablename__ = 'supplier_order_archive'
+    __table_args__ = (
+        db.Index('idx_supplier_archive_created', 'created_at'),
+        db.Index('idx_supplier_archive_supplier', 'supplier_id'),
+    )
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    item_id = db.Column(db.Integer, nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    supplier_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20))
+    batch_id = db.Column(db.String(32), nullable=True)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 
 class TransactionLog(db.Model):
     __tablename__ = 'transaction_logs'
@@ -71,15 +181,131 @@ class TransactionLog(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     action = db.Column(db.String(100), nullable=False)
     details = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+class LowStockItem(db.Model):
+    # Materialised set of items whose available stock is below threshold,
+    # maintained per item on commit (see refresh_low_stock)
+    __tablename__ = 'low_stock_items'
+    item_id = db.Column(db.Integer, db.ForeignKey('inventory.id', ondelete='CASCADE'), primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    stock = db.Column(db.Integer, nullable=False)
+    available = db.Column(db.Integer, nullable=False)
+    low_stock_threshold = db.Column(db.Integer, nullable=False)
+    pending_supply = db.Column(db.Integer, nullable=False, default=0)
+    suggested_reorder = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class ChangeEvent(db.Model):
+    # Append-only feed behind /events; the id doubles as the SSE event id
+    __tablename__ = 'change_events'
+    id = db.Column(db.Integer, primary_key=True)
+    event_type = db.Column(db.String(50), nullable=False)
+    audience = db.Column(db.String(20), nullable=False, default='admin')
+    user_id = db.Column(db.Integer, nullable=True)
+    payload = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+# Daily analytics rollups, fed from each commit's change events (see update_rollups)
+class RequestDailyItem(db.Model):
+    __tablename__ = 'request_daily_item'
+    day = db.Column(db.Date, primary_key=True)
+    item_id = db.Column(db.Integer, primary_key=True, index=True)
+    requests = db.Column(db.Integer, nullable=False, default=0)
+    requested_qty = db.Column(db.Integer, nullable=False, default=0)
+    approvals = db.Column(db.Integer, nullable=False, default=0)
+    approved_qty = db.Column(db.Integer, nullable=False, default=0)
+    rejections = db.Column(db.Integer, nullable=False, default=0)
+
+
+class RequestDailyEmployee(db.Model):
+    __tablename__ = 'request_daily_employee'
+    day = db.Column(db.Date, primary_key=True)
+    employee_id = db.Column(db.Integer, primary_key=True, index=True)
+    requests = db.Column(db.Integer, nullable=False, default=0)
+    requested_qty = db.Column(db.Integer, nullable=False, default=0)
+    approvals = db.Column(db.Integer, nullable=False, default=0)
+    approved_qty = db.Column(db.Integer, nullable=False, default=0)
+    rejections = db.Column(db.Integer, nullable=False, default=0)
+
+
+class SupplierDailyStats(db.Model):
+    __tablename__ = 'supplier_daily_stats'
+    day = db.Column(db.Date, primary_key=True)
+    supplier_id = db.Column(db.Integer, primary_key=True, index=True)
+    orders_placed = db.Column(db.Integer, nullable=False, default=0)
+    deliveries = db.Column(db.Integer, nullable=False, default=0)
+    delivered_qty = db.Column(db.Integer, nullable=False, default=0)
+    # Order placed -> delivered, summed over the day's deliveries
+    lead_seconds = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class DataVersion(db.Model):
+    # Write sequence per table, bumped right after each committing write;
+    # response ETags are derived from these
+    __tablename__ = 'data_versions'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class ImportJob(db.Model):
+    __tablename__ = 'import_jobs'
+    id = db.Column(db.String(32), primary_key=True)
+    # sha256 of the uploaded file; a retried upload of the same file maps to the same job
+    file_hash = db.Column(db.String(64), unique=True, nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    stored_path = db.Column(db.String(500), nullable=False)
+    status = db.Column(db.Enum('queued', 'running', 'completed', 'failed'), default='queued')
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    rows_read = db.Column(db.Integer, default=0)
+    inserted = db.Column(db.Integer, default=0)
+    updated = db.Column(db.Integer, default=0)
+    error_count = db.Column(db.Integer, default=0)
+    errors = db.Column(db.JSON)
+    # Last spreadsheet row whose changes are committed; a rerun resumes after it
+    last_row = db.Column(db.Integer, default=0)
+    message = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    # Refreshed when the job is queued and at every checkpoint; a job that stops
+    # beating was lost with the worker that held it (see recover_import_jobs)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
 
-class AuditLog(db.Model):
-    __tablename__ = 'audit_logs'
+    def to_dict(self):
+        elapsed = None
+        if self.started_at:
+            elapsed = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'rows_parsed': self.rows_read or 0,
+            'rows_written': (self.inserted or 0) + (self.updated or 0),
+            'inserted': self.inserted or 0,
+            'updated': self.updated or 0,
+            'error_count': self.error_count or 0,
+            'errors': self.errors or [],
+            'message': self.message,
+            'rows_per_second': round((self.rows_read or 0) / elapsed, 1) if elapsed else None,
+            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None,
+            'finished_at': self.finished_at.strftime('%Y-%m-%d %H:%M:%S') if self.finished_at else None
+        }
+
+
+class SupplierOrderDraft(db.Model):
+    # Reorder proposed by the forecast job; an admin turns it into a SupplierOrder
+    __tablename__ = 'supplier_order_drafts'
     id = db.Column(db.Integer, primary_key=True)
-    table_name = db.Column(db.String(50))
-    record_id = db.Column(db.Integer)
-    action = db.Column(db.String(10))  # INSERT/UPDATE/DELETE
-    old_values = db.Column(db.JSON)
-    new_values = db.Column(db.JSON)
-    changed_at = db.Column(db.DateTime, default=datetime.utcnow)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
\ No newline at end of file
+    item_id = db.Column(db.Integer, db.ForeignKey('inventory.id', ondelete='CASCADE'), nullable=False, index=True)
+    supplier_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+    quantity = db.Column(db.Integer, nullable=False)
+    daily_demand = db.Column(db.Float, nullable=False)
+    projected_stock = db.Column(db.Float, nullable=False)
+    lead_days = db.Column(db.Float, nullable=False)
+    method = db.Column(db.String(10), nullable=False)
+    status = db.Column(db.Enum('proposed', 'placed'), default='proposed', index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,126 @@
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class VerifierBusy(Exception):
+    # Too many logins already waiting for a verifier; the caller should retry later
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def hash_prefix(method):
+    # werkzeug fills in default costs ("scrypt" -> "scrypt:32768:8:1"), so
+    # hash once (per process, in the worker) to learn the exact prefix stored hashes should carry
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+def verify_and_rehash(stored_hash, password, method):
+    """Check a password; on success also return a new hash if the stored one is outdated.
+
+    Runs in a pool worker process, so it must stay importable without the app.
+    """
+    if not check_password_hash(stored_hash, password):
+        return False, None
+    if stored_hash.split('$', 1)[0] != hash_prefix(method):
+        return True, generate_password_hash(password, method=method)
+    return True, None
+
+
+class PasswordVerifier:
+    """Runs password checks in a bounded process pool, off the request threads.
+
+    At most ``workers`` hashes run at once and ``max_queue`` more may wait;
+    beyond that ``verify`` raises VerifierBusy straight away instead of
+    letting login bursts pile up behind the CPU. ``workers=0`` verifies
+    inline (single-process setups and scripts).
+
+    Workers start with forkserver/spawn, which re-import the main script,
+    so scripts importing the app need an ``if __name__ == '__main__'`` guard.
+    """
+
+    def __init__(self, method='scrypt', workers=2, max_queue=64, timeout=10):
+        self.method = method
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.verified = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _executor(self):
+        if self._pool is None:
+            # forkserver: don't fork a process that already runs request and scheduler threads
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+
+    def verify(self, stored_hash, password):
+        # Returns (matches, new_hash); new_hash is set when the stored hash should be replaced
+        if not stored_hash or password is None:
+            return False, None
+        if not self.workers:
+            return self._count(verify_and_rehash(stored_hash, password, self.method))
+
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise VerifierBusy()
+            self.in_flight += 1
+            pool = self._executor()
+        try:
+            future = pool.submit(verify_and_rehash, stored_hash, password, self.method)
+            try:
+                result = future.result(timeout=self.timeout)
+            except FutureTimeout:
+                future.cancel()
+                with self._lock:
+                    self.rejected += 1
+                raise VerifierBusy()
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM killed); start a fresh pool for the next login
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+                        pool.shutdown(wait=False, cancel_futures=True)
+                    self.rejected += 1
+                raise VerifierBusy()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return self._count(result)
+
+    def _count(self, result):
+        with self._lock:
+            self.verified += 1
+            if result[1]:
+                self.rehashed += 1
+        return result
+
+    def hash(self, password):
+        return generate_password_hash(password, method=self.method)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'method': self.method,
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'verified': self.verified,
+                'rejected': self.rejected,
+                'rehashed': self.rehashed
+            }
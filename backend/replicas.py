@@ -0,0 +1,223 @@
+import itertools
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event, text
+
+# session.info key set once a session has written; its later reads stay on the primary
+SESSION_WROTE = 'routing_wrote'
+# Cookie holding the time of the client's last write (see remember_write)
+WRITE_COOKIE = 'last_write'
+
+
+def replica_lag(connection):
+    # Seconds behind the primary; None when replication is broken.
+    # A server that isn't replicating at all (two standalone databases in
+    # local testing, SQLite files) counts as up to date.
+    if connection.dialect.name != 'mysql':
+        connection.execute(text('SELECT 1'))
+        return 0.0
+    try:
+        row = connection.execute(text('SHOW REPLICA STATUS')).mappings().first()
+    except Exception:
+        # MySQL < 8.0.22
+        row = connection.execute(text('SHOW SLAVE STATUS')).mappings().first()
+    if row is None:
+        return 0.0
+    lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+    return None if lag is None else float(lag)
+
+
+class Replica:
+    def __init__(self, engine):
+        self.engine = engine
+        self.healthy = True
+        self.lag = 0.0
+        self.checked_at = 0.0
+        self.reads = 0
+        self.failures = 0
+        self.error = None
+        self._lock = threading.Lock()
+        event.listen(engine, 'handle_error', self._on_error)
+
+    def _on_error(self, context):
+        if context.is_disconnect:
+            self.mark_down(f'{context.original_exception.__class__.__name__}: {context.original_exception}')
+
+    def check(self, max_lag, interval, force=False):
+        # Re-checked at most every `interval` seconds; one caller does the
+        # check while concurrent callers use the previous result
+        if not force and time.monotonic() - self.checked_at < interval:
+            return self.healthy
+        if not self._lock.acquire(blocking=False):
+            return self.healthy
+        try:
+            with self.engine.connect() as connection:
+                lag = replica_lag(connection)
+            self.lag = lag
+            self.healthy = lag is not None and lag <= max_lag
+            self.error = None if lag is not None else 'replication stopped'
+        except Exception as e:
+            self.healthy = False
+            self.failures += 1
+            self.error = f'{e.__class__.__name__}: {e}'
+            print(f"Replica {self.name} unavailable ({self.error})")
+        finally:
+            self.checked_at = time.monotonic()
+            self._lock.release()
+        return self.healthy
+
+    def mark_down(self, error):
+        # A connection failed mid-request; skip this replica until its next check
+        self.healthy = False
+        self.failures += 1
+        self.error = error
+        self.checked_at = time.monotonic()
+
+    @property
+    def name(self):
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaSet:
+    """Read replicas behind the primary, picked round-robin per request.
+
+    Replicas that fail a health check or lag more than ``max_lag`` seconds
+    are skipped until a later check passes; with none usable, reads fall
+    back to the primary. Clients that wrote in the last ``sticky_seconds``
+    read from the primary so they see their own changes; the write time
+    travels with the client in a cookie, so this holds across workers.
+    """
+
+    def __init__(self, engines, max_lag=5, check_interval=10, sticky_seconds=10):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        self.primary_reads = 0
+        self.fallbacks = 0
+        self._next = itertools.count()
+
+    def pick(self):
+        # Next usable replica in turn, or None (read from the primary)
+        count = len(self.replicas)
+        start = next(self._next)
+        for offset in range(count):
+            replica = self.replicas[(start + offset) % count]
+            if replica.check(self.max_lag, self.check_interval):
+                replica.reads += 1
+                return replica
+        self.fallbacks += 1
+        return None
+
+    def recently_wrote(self, wrote_at):
+        # wrote_at: the WRITE_COOKIE value (epoch seconds), or None
+        try:
+            age = time.time() - float(wrote_at)
+        except (TypeError, ValueError):
+            return False
+        return 0 <= age < self.sticky_seconds
+
+    def check_all(self):
+        for replica in self.replicas:
+            replica.check(self.max_lag, self.check_interval, force=True)
+
+    def stats(self):
+        return {
+            'replicas': len(self.replicas),
+            'healthy': sum(1 for replica in self.replicas if replica.healthy),
+            'primary_reads': self.primary_reads,
+            'fallbacks': self.fallbacks
+        }
+
+    def describe(self):
+        return [{
+            'database': replica.name,
+            'healthy': replica.healthy,
+            'lag_seconds': replica.lag,
+            'reads': replica.reads,
+            'failures': replica.failures,
+            'error': replica.error
+        } for replica in self.replicas]
+
+    def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+
+def create_replica_set(urls, engine_options, **kwargs):
+    engines = []
+    for url in urls:
+        options = engine_options(url)
+        # Plain QueuePool: the instrumented one reports the primary's pool only
+        options.pop('poolclass', None)
+        engines.append(create_engine(url, **options))
+    return ReplicaSet(engines, **kwargs)
+
+
+def route_reads_to_replica():
+    # Called by read-only handlers (see @replica_reads in app.py)
+    g.db_read_only = True
+
+
+def remember_write(response):
+    # after_request hook: a request that wrote hands the client its write time,
+    # so its reads on any worker stay on the primary for sticky_seconds
+    replicas = current_app.extensions.get('replicas')
+    wrote_at = g.get('db_wrote_at')
+    if replicas and wrote_at:
+        response.set_cookie(
+            WRITE_COOKIE, f'{wrote_at:.3f}', max_age=max(1, int(replicas.sticky_seconds)),
+            httponly=True, samesite='Lax'
+        )
+    return response
+
+
+class RoutingSession(Session):
+    """db.session that sends reads of read-only handlers to a replica.
+
+    Everything else goes to the primary: writes, flushes, SELECT ... FOR
+    UPDATE, work outside a request (scheduler, audit writer, scripts) and
+    any read after the session has written. One replica serves a whole
+    request so its reads see a single consistent point in time.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._is_replica_read(clause):
+            replica = self._request_replica()
+            if replica is not None:
+                return replica.engine
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if self._flushing or getattr(clause, 'is_dml', False):
+            self._note_write()
+        return engine
+
+    def _is_replica_read(self, clause):
+        # A plain SELECT, in a read-only handler, before this session wrote anything
+        if self._flushing or clause is None or not getattr(clause, 'is_select', False):
+            return False
+        if getattr(clause, '_for_update_arg', None) is not None:
+            return False
+        return has_request_context() and g.get('db_read_only', False) and not self.info.get(SESSION_WROTE)
+
+    def _request_replica(self):
+        # Decided on the first read of a request: a replica, or False for the primary
+        if 'db_replica' not in g:
+            g.db_replica = self._choose_replica() or False
+        return g.db_replica or None
+
+    def _choose_replica(self):
+        replicas = current_app.extensions.get('replicas')
+        if not replicas or not replicas.replicas:
+            return None
+        if replicas.recently_wrote(request.cookies.get(WRITE_COOKIE)):
+            replicas.primary_reads += 1
+            return None
+        return replicas.pick()
+
+    def _note_write(self):
+        self.info[SESSION_WROTE] = True
+        if has_request_context():
+            g.db_wrote_at = time.time()
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+def make_etag(key, versions):
+    # Strong validator: same endpoint/role/params and same table versions => same body
+    raw = json.dumps([key, sorted(versions.items())], separators=(',', ':'))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in candidates or f'"{etag}"' in candidates
+
+
+class MemoryCacheBackend:
+    # Per-process LRU keyed by ETag; stale bodies simply stop being asked for and age out
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag):
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(etag)
+            self.hits += 1
+            return entry
+
+    def set(self, etag, entry):
+        with self._lock:
+            self._entries[etag] = entry
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class DiskCacheBackend:
+    # One file per ETag in a directory shared by every worker on the host
+    # (point it at /dev/shm for a shared-memory cache)
+
+    def __init__(self, directory, maxsize=2048):
+        self.directory = directory
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, etag):
+        return os.path.join(self.directory, f'{etag}.json')
+
+    def get(self, etag):
+        try:
+            with open(self._path(etag), 'rb') as f:
+                header, body = f.read().split(b'\n', 1)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {'headers': json.loads(header), 'body': body}
+
+    def set(self, etag, entry):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.part')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(json.dumps(entry['headers']).encode() + b'\n' + entry['body'])
+        os.replace(temp_path, self._path(etag))
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._trim()
+
+    def _trim(self):
+        # Drop the oldest files once the directory holds more than maxsize entries
+        try:
+            paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.json')]
+            if len(paths) <= self.maxsize:
+                return
+            paths.sort(key=os.path.getmtime)
+            for path in paths[:len(paths) - self.maxsize]:
+                os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self):
+        return {'backend': 'disk', 'directory': self.directory, 'hits': self.hits, 'misses': self.misses}
+
+
+def create_backend(name, size, directory):
+    if name == 'none':
+        return None
+    if name == 'disk':
+        return DiskCacheBackend(directory, size)
+    return MemoryCacheBackend(size)
@@ -0,0 +1,17 @@
+# Scheduler entry point: runs the forecast, audit-retention, archive and import-recovery jobs
+# in a process of its own, next to the WSGI workers:
+#     python backend/scheduler.py
+# Intervals come from FORECAST_INTERVAL_HOURS, AUDIT_RETENTION_INTERVAL_HOURS
+# ARCHIVE_INTERVAL_HOURS and IMPORT_STALE_MINUTES (0 disables a job).
+import time
+
+from app import create_app, start_schedulers
+
+# No requests are served here: skip the search index and the login pool
+app = create_app({'RUN_SCHEDULERS': False, 'SEARCH_INDEX_PRELOAD': False, 'LOGIN_WORKERS': 0})
+
+if __name__ == '__main__':
+    start_schedulers(app)
+    print("Schedulers started")
+    while True:
+        time.sleep(3600)
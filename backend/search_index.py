@@ -0,0 +1,199 @@
+import bisect
+import heapq
+import re
+import threading
+import time
+from array import array
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+MAX_RESULTS = 1000
+# Substring matching needs a whole trigram; shorter queries can't use it
+TRIGRAM_LENGTH = 3
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def trigrams(text):
+    return {text[i:i + TRIGRAM_LENGTH] for i in range(len(text) - TRIGRAM_LENGTH + 1)}
+
+
+class SortedKeys:
+    # Sorted list that accepts cheap appends and sorts lazily before the next lookup
+
+    def __init__(self):
+        self._keys = []
+        self._dirty = False
+
+    def add(self, key):
+        self._keys.append(key)
+        self._dirty = True
+
+    def ensure_sorted(self):
+        if self._dirty:
+            self._keys.sort()
+            self._dirty = False
+
+    def from_prefix(self, prefix):
+        self.ensure_sorted()
+        keys = self._keys
+        for i in range(bisect.bisect_left(keys, (prefix,)), len(keys)):
+            if not keys[i][0].startswith(prefix):
+                break
+            yield keys[i]
+
+
+class SearchIndex:
+    """In-process prefix + trigram index over inventory names and descriptions.
+
+    Results come in ranked tiers: whole-name prefix (exact match first),
+    then word prefix, then substring, then description words. The first
+    tier is read straight off a sorted name list, so typeahead queries stop
+    after ``limit`` hits without touching the rest of the catalogue; later
+    tiers are only computed while the result list is still short.
+
+    With ``with_total`` every tier is matched so the true hit count comes
+    back alongside the first ``limit`` ranked ids; only those are ranked.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.names = {}
+        self._lower = {}
+        self._sorted_names = SortedKeys()
+        self._name_tokens = {}
+        self._sorted_name_tokens = SortedKeys()
+        self._description_tokens = {}
+        self._sorted_description_tokens = SortedKeys()
+        self._trigrams = {}
+        self.max_id = 0
+        self.built = False
+        self.synced_at = 0.0
+        self._sync_requested = True
+
+    def _post(self, postings, sorted_tokens, token, item_id):
+        ids = postings.get(token)
+        if ids is None:
+            postings[token] = ids = array('I')
+            if sorted_tokens is not None:
+                sorted_tokens.add((token,))
+        # Ids only grow (auto-increment), so postings stay sorted by appending
+        if not ids or ids[-1] != item_id:
+            ids.append(item_id)
+
+    def add(self, item_id, name, description=None):
+        with self._lock:
+            lower = name.lower()
+            self.names[item_id] = name
+            self._lower[item_id] = lower
+            self._sorted_names.add((lower, item_id))
+            for token in tokenize(name):
+                self._post(self._name_tokens, self._sorted_name_tokens, token, item_id)
+            for token in tokenize(description):
+                self._post(self._description_tokens, self._sorted_description_tokens, token, item_id)
+            grams = self._trigrams
+            for gram in trigrams(lower):
+                ids = grams.get(gram)
+                if ids is None:
+                    grams[gram] = ids = array('I')
+                ids.append(item_id)
+            self.max_id = max(self.max_id, item_id)
+
+    def add_many(self, rows):
+        with self._lock:
+            for item_id, name, description in rows:
+                if item_id not in self.names:
+                    self.add(item_id, name, description)
+
+    def request_sync(self):
+        self._sync_requested = True
+
+    def needs_sync(self, interval):
+        return not self.built or self._sync_requested or time.monotonic() - self.synced_at >= interval
+
+    def start_sync(self):
+        # Cleared before reading so a request made mid-sync triggers another pass
+        self._sync_requested = False
+
+    def mark_synced(self):
+        # Pay for sorting during the sync, not on the next keystroke
+        with self._lock:
+            for keys in (self._sorted_names, self._sorted_name_tokens, self._sorted_description_tokens):
+                keys.ensure_sorted()
+        self.built = True
+        self.synced_at = time.monotonic()
+
+    def _all_words(self, postings, sorted_tokens, words):
+        # Ids where every query word prefixes some token
+        matched = None
+        for word in sorted(words, key=len, reverse=True):
+            ids = set()
+            for (token,) in sorted_tokens.from_prefix(word):
+                ids.update(postings[token])
+            matched = ids if matched is None else matched & ids
+            if not matched:
+                return set()
+        return matched
+
+    def _best(self, ids, count):
+        lower = self._lower
+        return heapq.nsmallest(count, ids, key=lambda item_id: (len(lower[item_id]), lower[item_id], item_id))
+
+    def search(self, query, limit=MAX_RESULTS, with_total=False):
+        needle = query.strip().lower()
+        words = tokenize(needle)
+        if not words:
+            return ([], 0) if with_total else []
+
+        with self._lock:
+            results = []
+            # Every id matched so far; without with_total only the ranked ones
+            seen = set()
+
+            def done():
+                return len(results) >= limit and not with_total
+
+            def take(tier):
+                best = self._best(tier, max(limit - len(results), 0))
+                results.extend(best)
+                seen.update(tier if with_total else best)
+
+            # Tier 1: the name starts with the query (alphabetical, so an exact match leads)
+            for _, item_id in self._sorted_names.from_prefix(needle):
+                if len(results) < limit:
+                    results.append(item_id)
+                seen.add(item_id)
+                if done():
+                    return results
+
+            # Tier 2: every query word starts a word of the name
+            take(self._all_words(self._name_tokens, self._sorted_name_tokens, words) - seen)
+            if done():
+                return results
+
+            # Tier 3: the query appears anywhere in the name
+            if len(needle) >= TRIGRAM_LENGTH:
+                postings = [self._trigrams.get(g) for g in trigrams(needle)]
+                if all(postings):
+                    lower = self._lower
+                    take({
+                        item_id for item_id in min(postings, key=len)
+                        if item_id not in seen and needle in lower[item_id]
+                    })
+                    if done():
+                        return results
+
+            # Tier 4: description words
+            take(self._all_words(self._description_tokens, self._sorted_description_tokens, words) - seen)
+            return (results, len(seen)) if with_total else results
+
+    def stats(self):
+        with self._lock:
+            return {
+                'items': len(self.names),
+                'max_id': self.max_id,
+                'name_tokens': len(self._name_tokens),
+                'description_tokens': len(self._description_tokens),
+                'trigrams': len(self._trigrams)
+            }
@@ -0,0 +1,125 @@
+from datetime import datetime
+
+from sqlalchemy import case, update
+
+# session.info key collecting inventory ids whose stock changed in the
+# current transaction; derived data (e.g. the low-stock set) is refreshed
+# for just these items at commit time.
+TOUCHED_ITEMS = 'stock_touched_items'
+
+
+def mark_touched(session, item_ids):
+    session.info.setdefault(TOUCHED_ITEMS, set()).update(item_ids)
+
+
+def pop_touched(session):
+    return session.info.pop(TOUCHED_ITEMS, set())
+
+
+class StockLedger:
+    """Stock movements as single conditional UPDATE statements.
+
+    The availability check and the write happen in one statement, so
+    concurrent approvals can never take stock below zero and no row or
+    table lock is held across Python code. ``stock`` is what is on the
+    shelf; ``reserved`` is the part promised to pending requests.
+    """
+
+    def __init__(self, session, table, on_change=None):
+        self.session = session
+        self.table = table
+        # Called as on_change(item_id, movement, d_stock, d_reserved) for every applied movement
+        self.on_change = on_change
+
+    def _apply(self, item_id, condition, movement, d_stock=0, d_reserved=0):
+        table = self.table
+        c = table.c
+        values = {}
+        if d_stock:
+            values['stock'] = c.stock + d_stock
+        if d_reserved:
+            values['reserved'] = c.reserved + d_reserved
+        statement = update(table).where(c.id == item_id)
+        if condition is not None:
+            statement = statement.where(condition)
+        result = self.session.execute(
+            statement.values(updated_at=datetime.utcnow(), **values)
+        )
+        if result.rowcount == 1:
+            mark_touched(self.session, [item_id])
+            if self.on_change:
+                self.on_change(item_id, movement, d_stock, d_reserved)
+            return True
+        return False
+
+    def reserve(self, item_id, quantity):
+        # Hold stock for a pending request
+        c = self.table.c
+        return self._apply(item_id, c.stock - c.reserved >= quantity, 'reserve', d_reserved=quantity)
+
+    def release(self, item_id, quantity):
+        # Give a reservation back (request rejected)
+        c = self.table.c
+        return self._apply(item_id, c.reserved >= quantity, 'release', d_reserved=-quantity)
+
+    def fulfil(self, item_id, quantity):
+        # Turn a reservation into an actual stock decrement (request approved)
+        c = self.table.c
+        return self._apply(
+            item_id,
+            (c.reserved >= quantity) & (c.stock >= quantity),
+            'fulfil',
+            d_stock=-quantity,
+            d_reserved=-quantity
+        )
+
+    def take(self, item_id, quantity):
+        # Decrement unreserved stock directly (requests made without a reservation)
+        c = self.table.c
+        return self._apply(item_id, c.stock - c.reserved >= quantity, 'take', d_stock=-quantity)
+
+    def receive(self, item_id, quantity):
+        # Add delivered stock
+        return self._apply(item_id, None, 'receive', d_stock=quantity)
+
+    def receive_many(self, quantities):
+        # Delivered stock for many items ({item_id: quantity}) as one
+        # set-based UPDATE ... SET stock = stock + CASE id ... END.
+        # Returns how many inventory rows were updated.
+        if not quantities:
+            return 0
+        c = self.table.c
+        result = self.session.execute(
+            update(self.table)
+            .where(c.id.in_(list(quantities)))
+            .values(stock=c.stock + case(quantities, value=c.id, else_=0), updated_at=datetime.utcnow())
+        )
+        mark_touched(self.session, list(quantities))
+        if self.on_change:
+            for item_id, quantity in quantities.items():
+                self.on_change(item_id, 'receive', quantity, 0)
+        return result.rowcount
+
+    def apply_deltas(self, deltas):
+        # Net stock/reserved changes for many items in one set-based UPDATE
+        # (CASE on id). Callers lock and check the rows first; the WHERE clause
+        # is a safety net, so a short rowcount means the batch must be rolled back.
+        if not deltas:
+            return True
+        c = self.table.c
+        d_stock = case({d['item_id']: d['d_stock'] for d in deltas}, value=c.id, else_=0)
+        d_reserved = case({d['item_id']: d['d_reserved'] for d in deltas}, value=c.id, else_=0)
+        new_stock = c.stock + d_stock
+        new_reserved = c.reserved + d_reserved
+        result = self.session.execute(
+            update(self.table)
+            .where(c.id.in_([d['item_id'] for d in deltas]))
+            .where(new_reserved >= 0)
+            .where(new_stock >= new_reserved)
+            .values(stock=new_stock, reserved=new_reserved, updated_at=datetime.utcnow())
+        )
+        mark_touched(self.session, [d['item_id'] for d in deltas])
+        if self.on_change:
+            for d in deltas:
+                self.on_change(d['item_id'], 'batch', d['d_stock'], d['d_reserved'])
+        return result.rowcount == len(deltas)
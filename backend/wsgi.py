@@ -0,0 +1,7 @@
+# WSGI entry point, e.g. gunicorn --chdir backend wsgi:app
+# Background jobs (forecast, audit retention, archive) don't run in the web
+# workers unless RUN_SCHEDULERS is set; with several workers run
+# backend/scheduler.py as one separate process instead.
+from app import create_app
+
+app = create_app()
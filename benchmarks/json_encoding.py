@@ -0,0 +1,134 @@
+"""Compare list-response serialisation: per-row dicts + stdlib json vs the
+column-wise serializer with the fast encoder, as objects and as columns.
+
+Rows come from a real SQLAlchemy query (in-memory SQLite) shaped like
+/admin/requests, so row attribute access costs what it does in the app.
+
+    python benchmarks/json_encoding.py --rows 10000 100000
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, insert, select
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), 'backend'))
+
+from serialization import Field, format_datetime, orjson, serialize_rows  # noqa: E402
+
+FIELDS = (
+    Field('id'),
+    Field('item_name', default='Unknown Item'),
+    Field('quantity'),
+    Field('stock', default=0),
+    Field('status'),
+    Field('employee_name', default='Unknown Employee'),
+    Field('created_at', format=format_datetime)
+)
+
+
+def load_rows(count, seed=1):
+    rng = random.Random(seed)
+    engine = create_engine('sqlite://')
+    table = Table(
+        'rows', MetaData(),
+        Column('id', Integer, primary_key=True), Column('item_name', String), Column('quantity', Integer),
+        Column('stock', Integer), Column('status', String), Column('employee_name', String), Column('created_at', DateTime)
+    )
+    table.metadata.create_all(engine)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(insert(table), [{
+            'id': i + 1,
+            'item_name': f'blue pen {rng.randint(1, 100000)}',
+            'quantity': rng.randint(1, 5),
+            'stock': rng.randint(0, 500),
+            'status': rng.choice(['pending', 'approved', 'rejected']),
+            'employee_name': f'employee{rng.randint(0, 200)}',
+            'created_at': start + timedelta(seconds=rng.randint(0, 365 * 86400))
+        } for i in range(count)])
+        return connection.execute(select(table)).all()
+
+
+def current(rows):
+    # What the handlers did before: a dict per row with strftime, then Flask's stdlib provider
+    data = [{
+        'id': req.id,
+        'item_name': req.item_name or 'Unknown Item',
+        'quantity': req.quantity,
+        'stock': req.stock or 0,
+        'status': req.status,
+        'employee_name': req.employee_name or 'Unknown Employee',
+        'created_at': req.created_at.strftime('%Y-%m-%d %H:%M:%S')
+    } for req in rows]
+    return data, lambda: json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
+
+
+def fast(rows, columnar):
+    data = serialize_rows(rows, FIELDS, columnar)
+    if orjson is not None:
+        return data, lambda: orjson.dumps(data)
+    return data, lambda: json.dumps(data, separators=(',', ':')).encode()
+
+
+def measure(build, rows, repeat):
+    best_build = best_encode = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data, encode = build(rows)
+        built = time.perf_counter()
+        body = encode()
+        encoded = time.perf_counter()
+        best_build = min(best_build, built - started)
+        best_encode = min(best_encode, encoded - built)
+    return {
+        'build_ms': round(best_build * 1000, 1),
+        'encode_ms': round(best_encode * 1000, 1),
+        'total_ms': round((best_build + best_encode) * 1000, 1),
+        'bytes': len(body),
+        'gzip_bytes': len(gzip.compress(body, 6)),
+        'body': body
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5, help='best of N runs')
+    parser.add_argument('--output', help='write the results JSON here')
+    args = parser.parse_args()
+
+    print(f"Encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json (orjson not installed)'}")
+    variants = (
+        ('current', current),
+        ('fast_objects', lambda rows: fast(rows, False)),
+        ('fast_columns', lambda rows: fast(rows, True))
+    )
+    results = {}
+    for count in args.rows:
+        rows = load_rows(count)
+        results[count] = {name: measure(build, rows, args.repeat) for name, build in variants}
+        # The object format must stay byte-for-byte compatible once parsed
+        assert json.loads(results[count]['current']['body']) == json.loads(results[count]['fast_objects']['body'])
+        print(f"\n{count} rows")
+        print(f"{'variant':<14}{'build ms':>10}{'encode ms':>11}{'total ms':>10}{'bytes':>12}{'gzip bytes':>12}{'speedup':>9}")
+        baseline = results[count]['current']
+        for name, row in results[count].items():
+            row.pop('body')
+            speedup = baseline['total_ms'] / row['total_ms'] if row['total_ms'] else 0
+            print(f"{name:<14}{row['build_ms']:>10}{row['encode_ms']:>11}{row['total_ms']:>10}"
+                  f"{row['bytes']:>12}{row['gzip_bytes']:>12}{speedup:>8.1f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
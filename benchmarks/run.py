@@ -0,0 +1,438 @@
+"""Load-test the Flask API end to end.
+
+Seeds a database, serves backend/app.py on a local threaded server and
+drives each route with concurrent HTTP clients. Reports latency
+percentiles, throughput, SQL statements per request and peak RSS, and
+compares them with a stored baseline.
+
+    python benchmarks/run.py --items 100000 --requests 1000000 --save-baseline
+    python benchmarks/run.py --skip-seed --compare benchmarks/baseline.json
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.join(os.path.dirname(HERE), 'backend')
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def current_rss_mb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux (a high-water mark, not the current value)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class RssSampler:
+    # Peak resident memory while a scenario runs (exports are the interesting case)
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_mb())
+
+
+class Client:
+    def __init__(self, port):
+        self.port = port
+        self.local = threading.local()
+
+    def request(self, method, path, token=None, body=None, headers=None, content_type='application/json'):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = self.local.connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=600)
+        headers = dict(headers or {})
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        if body is not None:
+            headers['Content-Type'] = content_type
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            self.local.connection = None
+            raise
+        if response.will_close:
+            connection.close()
+        return response.status, data
+
+
+def multipart(filename, content):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: text/csv\r\n\r\n'
+    ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+class Context:
+    """Tokens and id pools shared by the scenarios."""
+
+    def __init__(self, A, app, client, seed_module):
+        self.A = A
+        self.client = client
+        self.rng = random.Random(7)
+        self.lock = threading.Lock()
+        self.tokens = {}
+        for role, name in (('admin', 'admin0'), ('employee', 'employee0'), ('supplier', 'supplier0')):
+            status, data = client.request('POST', '/login', body={'username': name, 'password': seed_module.BENCH_PASSWORD})
+            if status != 200:
+                raise SystemExit(f'Login as {name} failed ({status}): {data[:200]}')
+            self.tokens[role] = json.loads(data)['token']
+
+        with app.app_context():
+            db = A.db
+            self.item_count = db.session.query(A.func.max(A.Inventory.id)).scalar() or 1
+            self.pending = iter([row_id for (row_id,) in db.session.query(A.EmployeeRequest.id).filter(
+                A.EmployeeRequest.status == 'pending').order_by(A.EmployeeRequest.id.desc()).limit(200000)])
+            supplier_id = db.session.query(A.User.id).filter(A.User.username == 'supplier0').scalar()
+            self.supplier_id = supplier_id
+            self.open_orders = iter([row_id for (row_id,) in db.session.query(A.SupplierOrder.id).filter(
+                A.SupplierOrder.supplier_id == supplier_id, A.SupplierOrder.status == 'pending'
+            ).order_by(A.SupplierOrder.id)])
+            self.words = [name.split()[1] for (name,) in db.session.query(A.Inventory.name).limit(200)]
+        self.upload_run = itertools.count()
+
+    def take(self, pool, count=1):
+        with self.lock:
+            return list(itertools.islice(pool, count))
+
+    def random_item(self):
+        with self.lock:
+            return self.rng.randint(1, self.item_count)
+
+    def random_word(self):
+        with self.lock:
+            return self.rng.choice(self.words)
+
+
+def scenario_login(ctx, i):
+    from seed import BENCH_PASSWORD
+    return ctx.client.request('POST', '/login', body={'username': f'employee{i % 10}', 'password': BENCH_PASSWORD})
+
+
+def scenario_items_search(ctx, i):
+    return ctx.client.request('GET', f'/items?search={ctx.random_word()}&limit=20', ctx.tokens['employee'])
+
+
+def scenario_items_typeahead(ctx, i):
+    return ctx.client.request('GET', f'/items/typeahead?q={ctx.random_word()[:3]}', ctx.tokens['employee'])
+
+
+def scenario_items_page(ctx, i):
+    return ctx.client.request('GET', '/items?limit=100', ctx.tokens['employee'])
+
+
+def scenario_requests_list(ctx, i):
+    return ctx.client.request('GET', '/requests?limit=100', ctx.tokens['employee'])
+
+
+def scenario_admin_requests(ctx, i):
+    return ctx.client.request('GET', '/admin/requests?limit=100&status=pending', ctx.tokens['admin'])
+
+
+def scenario_admin_orders(ctx, i):
+    return ctx.client.request('GET', '/admin/orders?limit=100', ctx.tokens['admin'])
+
+
+def scenario_requests_submit(ctx, i):
+    return ctx.client.request('POST', '/requests', ctx.tokens['employee'], {'item_id': ctx.random_item(), 'quantity': 1})
+
+
+def scenario_requests_approve(ctx, i):
+    ids = ctx.take(ctx.pending)
+    if not ids:
+        return 599, b'no pending requests left'
+    status = ctx.rng.choice(['approved', 'rejected'])
+    return ctx.client.request('PATCH', f'/requests/{ids[0]}', ctx.tokens['admin'], {'status': status})
+
+
+def scenario_requests_batch(ctx, i):
+    ids = ctx.take(ctx.pending, 50)
+    if not ids:
+        return 599, b'no pending requests left'
+    return ctx.client.request('PATCH', '/requests/batch', ctx.tokens['admin'], {'ids': ids, 'status': 'approved'})
+
+
+def scenario_supplier_orders(ctx, i):
+    return ctx.client.request('GET', '/supplier-orders?limit=100', ctx.tokens['supplier'])
+
+
+def scenario_supplier_place(ctx, i):
+    return ctx.client.request('POST', '/supplier-orders', ctx.tokens['admin'], {
+        'item_id': ctx.random_item(), 'quantity': 50, 'supplier_id': ctx.supplier_id
+    })
+
+
+def scenario_supplier_deliver(ctx, i):
+    ids = ctx.take(ctx.open_orders)
+    if not ids:
+        return 599, b'no open supplier orders left'
+    return ctx.client.request('PATCH', f'/supplier-orders/{ids[0]}', ctx.tokens['supplier'], {'status': 'delivered'})
+
+
+def scenario_upload_inventory(ctx, i):
+    # 1000-row CSV (new items plus repeat rows restocked from earlier runs); timed until the job finishes
+    run = f'{next(ctx.upload_run)}-{uuid.uuid4().hex[:8]}'
+    lines = ['name,description,stock,low_stock_threshold']
+    lines += [f'bench upload {run} {n},uploaded,{n % 50 + 1},10' for n in range(500)]
+    lines += [f'{ctx.words[n % len(ctx.words)]} restock {n},restock,5,10' for n in range(500)]
+    body, content_type = multipart(f'bench_{run}.csv', '\n'.join(lines).encode())
+    status, data = ctx.client.request('POST', '/upload-inventory', ctx.tokens['admin'], body, content_type=content_type)
+    if status != 202:
+        return status, data
+    job_id = json.loads(data)['job']['id']
+    while True:
+        status, data = ctx.client.request('GET', f'/jobs/{job_id}', ctx.tokens['admin'])
+        job = json.loads(data)
+        if job['status'] in ('completed', 'failed'):
+            return (200 if job['status'] == 'completed' else 500), data
+        time.sleep(0.05)
+
+
+def scenario_export_employee(ctx, i):
+    return ctx.client.request('GET', '/employee/orders/export', ctx.tokens['employee'])
+
+
+def scenario_export_admin(ctx, i):
+    return ctx.client.request('GET', '/admin/orders/export', ctx.tokens['admin'])
+
+
+def scenario_analytics_top(ctx, i):
+    return ctx.client.request('GET', '/analytics/items/top?metric=approved_qty&limit=20', ctx.tokens['admin'])
+
+
+def scenario_low_stock(ctx, i):
+    return ctx.client.request('GET', '/inventory/low-stock?limit=100', ctx.tokens['admin'])
+
+
+# name -> (function, default iterations); heavy scenarios run fewer times
+SCENARIOS = {
+    'login': (scenario_login, 50),
+    'items_search': (scenario_items_search, 500),
+    'items_typeahead': (scenario_items_typeahead, 500),
+    'items_page': (scenario_items_page, 500),
+    'requests_list': (scenario_requests_list, 500),
+    'admin_requests': (scenario_admin_requests, 300),
+    'admin_orders': (scenario_admin_orders, 300),
+    'requests_submit': (scenario_requests_submit, 500),
+    'requests_approve': (scenario_requests_approve, 500),
+    'requests_batch': (scenario_requests_batch, 50),
+    'supplier_orders': (scenario_supplier_orders, 300),
+    'supplier_place': (scenario_supplier_place, 200),
+    'supplier_deliver': (scenario_supplier_deliver, 200),
+    'low_stock': (scenario_low_stock, 300),
+    'analytics_top': (scenario_analytics_top, 200),
+    'upload_inventory': (scenario_upload_inventory, 5),
+    'export_employee': (scenario_export_employee, 3),
+    'export_admin': (scenario_export_admin, 1)
+}
+
+
+def sql_totals(A):
+    # Sum of SQL statements and request count over every endpoint (server side, this process)
+    statements = requests = 0
+    with A.request_metrics._lock:
+        for stats in A.request_metrics._endpoints.values():
+            statements += stats.sql_statements.total
+            requests += stats.sql_statements.count
+    return statements, requests
+
+
+def run_scenario(ctx, name, function, iterations, clients):
+    latencies = []
+    errors = []
+    counter = itertools.count()
+    sql_before = sql_totals(ctx.A)
+    response_bytes = [0]
+
+    def worker():
+        while True:
+            i = next(counter)
+            if i >= iterations:
+                return
+            started = time.perf_counter()
+            try:
+                status, data = function(ctx, i)
+            except Exception as e:
+                status, data = 0, str(e).encode()
+            elapsed = time.perf_counter() - started
+            latencies.append(elapsed)
+            response_bytes[0] += len(data)
+            if status >= 400 or status == 0:
+                errors.append((status, data[:200]))
+
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            for _ in range(clients):
+                pool.submit(worker)
+        wall = time.perf_counter() - started
+
+    sql_after = sql_totals(ctx.A)
+    served = sql_after[1] - sql_before[1]
+    if errors:
+        print(f'  {name}: {len(errors)} errors, first: {errors[0]}')
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput_rps': round(len(latencies) / wall, 2) if wall else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        'sql_per_request': round((sql_after[0] - sql_before[0]) / served, 2) if served else None,
+        'response_kb': round(response_bytes[0] / 1024 / max(len(latencies), 1), 1),
+        'peak_rss_mb': round(rss.peak, 1)
+    }
+
+
+def compare(results, baseline, tolerance):
+    # A scenario regresses when p95 grows or throughput drops by more than
+    # `tolerance`, or it issues more SQL per request than before
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        checks = []
+        if previous.get('p95_ms') and current['p95_ms'] and current['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            checks.append(f"p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+        if previous.get('throughput_rps') and current['throughput_rps'] and \
+                current['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            checks.append(f"throughput {previous['throughput_rps']} -> {current['throughput_rps']} rps")
+        if previous.get('sql_per_request') is not None and current['sql_per_request'] is not None and \
+                current['sql_per_request'] > previous['sql_per_request'] + 0.5:
+            checks.append(f"sql/request {previous['sql_per_request']} -> {current['sql_per_request']}")
+        if checks:
+            regressions.append((name, checks))
+    return regressions
+
+
+def print_table(results):
+    columns = ('requests', 'errors', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'sql_per_request', 'response_kb', 'peak_rss_mb')
+    print(f"{'scenario':<18}" + ''.join(f'{c:>16}' for c in columns))
+    for name, row in results.items():
+        print(f'{name:<18}' + ''.join(f"{'' if row[c] is None else row[c]:>16}" for c in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help='SQLAlchemy URL (default: SQLite file in benchmarks/)')
+    parser.add_argument('--skip-seed', action='store_true', help='reuse the data already in the database')
+    parser.add_argument('--users', type=int, default=10, help='users per role')
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=1000000)
+    parser.add_argument('--supplier-orders', type=int, default=20000)
+    parser.add_argument('--clients', type=int, default=8, help='concurrent HTTP clients')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every scenario iteration count')
+    parser.add_argument('--scenarios', help='comma-separated subset of: ' + ', '.join(SCENARIOS))
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--output', help='write the results JSON here')
+    parser.add_argument('--compare', default=DEFAULT_BASELINE, help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    database = args.database or 'sqlite:///' + os.path.join(HERE, 'bench.db')
+    os.environ['DATABASE_URL'] = database
+    # Keep uploaded CSVs out of backend/instance
+    os.environ.setdefault('UPLOAD_FOLDER', os.path.join(HERE, 'uploads'))
+    sys.path.insert(0, BACKEND)
+    sys.path.insert(0, HERE)
+    import app as A
+    import seed as seed_module
+    from werkzeug.serving import make_server
+
+    app = A.create_app()
+
+    if not args.skip_seed:
+        started = time.perf_counter()
+        counts = seed_module.seed(A, app, args.users, args.items, args.requests, args.supplier_orders)
+        print(f'Seeded {counts} in {time.perf_counter() - started:.1f}s')
+
+    server = make_server('127.0.0.1', args.port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = Client(args.port)
+    ctx = Context(A, app, client, seed_module)
+
+    names = args.scenarios.split(',') if args.scenarios else list(SCENARIOS)
+    results = {}
+    for name in names:
+        function, iterations = SCENARIOS[name]
+        iterations = max(1, int(iterations * args.scale))
+        print(f'Running {name} ({iterations} requests, {args.clients} clients)...')
+        results[name] = run_scenario(ctx, name, function, iterations, args.clients)
+    server.shutdown()
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'database': database.split('@')[-1],
+        'data': {'users_per_role': args.users, 'items': args.items, 'requests': args.requests},
+        'clients': args.clients,
+        'results': results
+    }
+    print_table(results)
+
+    regressions = []
+    if args.compare and os.path.exists(args.compare) and not args.save_baseline:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, checks in regressions:
+            print(f'REGRESSION {name}: ' + '; '.join(checks))
+        if not regressions:
+            print(f'No regressions against {args.compare}')
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.compare or DEFAULT_BASELINE, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Baseline saved to {args.compare or DEFAULT_BASELINE}')
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, insert, update
+from werkzeug.security import generate_password_hash
+
+BENCH_PASSWORD = 'bench123'
+ADJECTIVES = ['blue', 'black', 'red', 'green', 'premium', 'recycled', 'mini', 'large', 'spiral', 'glossy',
+              'matte', 'heavy', 'soft', 'fine', 'bold', 'pastel', 'neon', 'classic', 'eco', 'pocket']
+NOUNS = ['pen', 'pencil', 'notebook', 'stapler', 'marker', 'eraser', 'folder', 'binder', 'envelope', 'tape',
+         'scissors', 'ruler', 'highlighter', 'paper', 'clip', 'glue', 'sharpener', 'calculator', 'label', 'pad']
+
+
+def usernames(role, count):
+    return [f'{role}{i}' for i in range(count)]
+
+
+def seed(A, app, users_per_role=10, items=100000, requests=1000000, supplier_orders=20000, batch_size=50000, seed=42):
+    """Fill the app's database with a deterministic, realistically shaped data set.
+
+    Users share one password hash (hashing is the slow part of seeding).
+    Requests spread over two years: ~70% approved, ~20% rejected and the
+    rest pending with their stock reserved, as the app would leave them.
+    """
+    rng = random.Random(seed)
+    db = A.db
+    now = datetime.utcnow()
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        password_hash = generate_password_hash(BENCH_PASSWORD)
+        user_rows = []
+        for role in ('admin', 'employee', 'supplier'):
+            user_rows += [{'username': name, 'password_hash': password_hash, 'role': role}
+                          for name in usernames(role, users_per_role)]
+        db.session.execute(insert(A.User.__table__), user_rows)
+        ids_by_role = {}
+        for user_id, role in db.session.query(A.User.id, A.User.role):
+            ids_by_role.setdefault(role, []).append(user_id)
+
+        stock = []
+        for start in range(0, items, batch_size):
+            rows = []
+            for i in range(start, min(start + batch_size, items)):
+                level = rng.randint(0, 500)
+                stock.append(level)
+                rows.append({
+                    'name': f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}',
+                    'description': f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} for office use',
+                    'stock': level,
+                    'reserved': 0,
+                    'low_stock_threshold': 10,
+                    'created_at': now,
+                    'updated_at': now
+                })
+            db.session.execute(insert(A.Inventory.__table__), rows)
+        db.session.commit()
+
+        reserved = {}
+        employees = ids_by_role['employee']
+        for start in range(0, requests, batch_size):
+            rows = []
+            for _ in range(start, min(start + batch_size, requests)):
+                item_id = rng.randint(1, items)
+                quantity = rng.randint(1, 5)
+                roll = rng.random()
+                status = 'approved' if roll < 0.7 else 'rejected' if roll < 0.9 else 'pending'
+                held = 0
+                if status == 'pending' and stock[item_id - 1] - reserved.get(item_id, 0) >= quantity:
+                    held = quantity
+                    reserved[item_id] = reserved.get(item_id, 0) + quantity
+                rows.append({
+                    'employee_id': rng.choice(employees),
+                    'item_id': item_id,
+                    'quantity': quantity,
+                    'reason': 'restock desk',
+                    'status': status,
+                    'reserved_quantity': held,
+                    'created_at': now - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+                })
+            db.session.execute(insert(A.EmployeeRequest.__table__), rows)
+            db.session.commit()
+
+        if reserved:
+            table = A.Inventory.__table__
+            db.session.execute(
+                update(table).where(table.c.id == bindparam('item_id')).values(reserved=bindparam('held')),
+                [{'item_id': item_id, 'held': held} for item_id, held in reserved.items()]
+            )
+
+        suppliers = ids_by_role['supplier']
+        rows = []
+        for _ in range(supplier_orders):
+            created = now - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+            status = rng.choice(['pending', 'shipped', 'delivered', 'delivered'])
+            rows.append({
+                'item_id': rng.randint(1, items),
+                'quantity': rng.randint(10, 200),
+                'supplier_id': rng.choice(suppliers),
+                'status': status,
+                'created_at': created,
+                'updated_at': created + timedelta(hours=rng.randint(1, 240)) if status != 'pending' else created
+            })
+        for start in range(0, len(rows), batch_size):
+            db.session.execute(insert(A.SupplierOrder.__table__), rows[start:start + batch_size])
+        db.session.commit()
+
+        A.rebuild_low_stock()
+        A.rebuild_rollups()
+        db.session.commit()
+        return {'users': len(user_rows), 'items': items, 'requests': requests, 'supplier_orders': supplier_orders}
@@ -0,0 +1,158 @@
+"""Measure worker cold start: import, create_app() and first-request latency.
+
+Each sample is a fresh Python process, as a gunicorn worker would be. The
+probe also records which heavy optional modules got loaded along the way.
+
+    python benchmarks/startup.py --workers 10
+    python benchmarks/startup.py --workers 10 --save-baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.join(os.path.dirname(HERE), 'backend')
+DEFAULT_BASELINE = os.path.join(HERE, 'startup_baseline.json')
+HEAVY_MODULES = ('pandas', 'openpyxl', 'numpy')
+METRICS = ('process_ms', 'import_ms', 'create_app_ms', 'first_request_ms', 'second_request_ms', 'rss_mb')
+
+
+def probe(user_id, path):
+    # Runs inside the child process
+    started = time.perf_counter()
+    sys.path.insert(0, BACKEND)
+    import app as A
+    imported = time.perf_counter()
+    app = A.create_app()
+    created = time.perf_counter()
+
+    import jwt
+    from datetime import datetime, timedelta
+    token = jwt.encode({'id': user_id, 'exp': datetime.utcnow() + timedelta(minutes=5)}, app.config['SECRET_KEY'], algorithm='HS256')
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    timings = []
+    for _ in range(2):
+        t = time.perf_counter()
+        response = client.get(path, headers=headers)
+        timings.append(time.perf_counter() - t)
+        if response.status_code != 200:
+            raise SystemExit(f'{path} returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+
+    rss = 0.0
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                rss = int(line.split()[1]) / 1024
+    print(json.dumps({
+        'import_ms': (imported - started) * 1000,
+        'create_app_ms': (created - imported) * 1000,
+        'first_request_ms': timings[0] * 1000,
+        'second_request_ms': timings[1] * 1000,
+        'rss_mb': rss,
+        'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules]
+    }))
+
+
+def prepare_database():
+    # Make sure the schema and one employee exist; returns that user's id
+    sys.path.insert(0, BACKEND)
+    import app as A
+    app = A.create_app()
+    with app.app_context():
+        A.db.create_all()
+        user = A.User.query.filter_by(role='employee').first()
+        if user is None:
+            user = A.User(username='startup_probe', role='employee')
+            user.set_password('startup_probe')
+            A.db.session.add(user)
+            A.db.session.commit()
+        return user.id
+
+
+def summarise(samples):
+    summary = {}
+    for metric in METRICS:
+        values = sorted(sample[metric] for sample in samples)
+        summary[metric] = {
+            'median': round(statistics.median(values), 1),
+            'p95': round(values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))], 1),
+            'max': round(values[-1], 1)
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', help='SQLAlchemy URL (default: SQLite file in benchmarks/)')
+    parser.add_argument('--workers', type=int, default=10, help='fresh processes to sample')
+    parser.add_argument('--path', default='/items?limit=20', help='endpoint for the first request')
+    parser.add_argument('--compare', default=DEFAULT_BASELINE, help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--probe', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe is not None:
+        probe(args.probe, args.path)
+        return
+
+    os.environ['DATABASE_URL'] = args.database or 'sqlite:///' + os.path.join(HERE, 'bench.db')
+    # Logins aren't exercised here; verify inline so no process pool is started
+    os.environ.setdefault('LOGIN_WORKERS', '0')
+    user_id = prepare_database()
+
+    samples = []
+    for i in range(args.workers):
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--probe', str(user_id), '--path', args.path],
+            capture_output=True, text=True, env=os.environ.copy()
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise SystemExit(f'Worker {i} failed:\n{result.stderr[-2000:]}')
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        sample['process_ms'] = elapsed
+        samples.append(sample)
+
+    summary = summarise(samples)
+    heavy = sorted({name for sample in samples for name in sample['heavy_modules']})
+    print(f"{'metric':<20}{'median':>10}{'p95':>10}{'max':>10}")
+    for metric, values in summary.items():
+        print(f"{metric:<20}{values['median']:>10}{values['p95']:>10}{values['max']:>10}")
+    print(f"Heavy modules loaded by first request: {', '.join(heavy) or 'none'}")
+
+    report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'workers': args.workers, 'path': args.path,
+              'summary': summary, 'heavy_modules': heavy}
+    regressions = []
+    if args.save_baseline:
+        with open(args.compare, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Baseline saved to {args.compare}')
+    elif args.compare and os.path.exists(args.compare):
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for metric in ('process_ms', 'create_app_ms', 'first_request_ms'):
+            before = baseline['summary'].get(metric, {}).get('median')
+            after = summary[metric]['median']
+            if before and after > before * (1 + args.tolerance):
+                regressions.append(f'{metric} median {before} -> {after} ms')
+        for name in heavy:
+            if name not in baseline.get('heavy_modules', []):
+                regressions.append(f'{name} is now imported at startup')
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if not regressions:
+            print(f'No regressions against {args.compare}')
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
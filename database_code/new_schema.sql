@@ -71,45 +71,6 @@ CREATE TABLE IF NOT EXISTS audit_logs (
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
 );
 
--- 2. Fix the triggers (only need one version, remove duplicates)
-DELIMITER //
-
-CREATE TRIGGER inventory_after_update
-AFTER UPDATE ON inventory
-FOR EACH ROW
-BEGIN
-    -- Only log if stock actually changed
-    IF NEW.stock != OLD.stock THEN
-        INSERT INTO audit_logs (table_name, record_id, action, old_values, new_values)
-        VALUES (
-            'inventory', 
-            NEW.id, 
-            'UPDATE',
-            JSON_OBJECT('stock', OLD.stock, 'low_stock_threshold', OLD.low_stock_threshold),
-            JSON_OBJECT('stock', NEW.stock, 'low_stock_threshold', NEW.low_stock_threshold)
-        );
-    END IF;
-END//
-select * from inventory;
-CREATE TRIGGER request_after_update
-AFTER UPDATE ON employee_requests
-FOR EACH ROW
-BEGIN
-    -- Only log status changes
-    IF NEW.status != OLD.status THEN
-        INSERT INTO audit_logs (table_name, record_id, action, old_values, new_values)
-        VALUES (
-            'employee_requests', 
-            NEW.id, 
-            'UPDATE',
-            JSON_OBJECT('status', OLD.status),
-            JSON_OBJECT('status', NEW.status)
-        );
-    END IF;
-END//
-
-DELIMITER ;
-
 -- 3. Insert sample data
 INSERT INTO departments (name, description) VALUES 
 ('HR', 'Handles employee relations and policies'),
@@ -234,3 +195,93 @@ DELIMITER ;
 
 -- Call the procedure
 CALL list_all_categories();
+
+-- Stock reservations (app-managed tables; the ORM names the request table employee_request)
+ALTER TABLE inventory ADD COLUMN reserved INT NOT NULL DEFAULT 0;
+ALTER TABLE inventory ADD CONSTRAINT chk_reserved CHECK (reserved >= 0 AND reserved <= stock);
+ALTER TABLE employee_request ADD COLUMN reserved_quantity INT NOT NULL DEFAULT 0;
+
+-- Auditing is done by the application (batched background writer); databases
+-- built from the older schema.sql still have the per-row triggers, so drop them
+DROP TRIGGER IF EXISTS inventory_after_update;
+DROP TRIGGER IF EXISTS request_after_update;
+-- Retention purges by age
+CREATE INDEX idx_audit_changed_at ON audit_logs (changed_at);
+CREATE INDEX idx_transaction_created_at ON transaction_logs (created_at);
+
+-- Archive storage for closed requests / delivered supplier orders (filled by the app's archive job).
+-- No foreign keys, so the archive can be range-partitioned by month; add next month's
+-- partition ahead of time with: ALTER TABLE ... REORGANIZE PARTITION pmax INTO (PARTITION pYYYYMM ..., PARTITION pmax ...)
+-- and drop whole months with ALTER TABLE ... DROP PARTITION pYYYYMM.
+CREATE INDEX idx_request_status_created ON employee_request (status, created_at);
+CREATE INDEX idx_supplier_order_status_created ON supplier_order (status, created_at);
+
+CREATE TABLE IF NOT EXISTS employee_request_archive (
+    id INT NOT NULL,
+    employee_id INT NOT NULL,
+    item_id INT NOT NULL,
+    quantity INT NOT NULL,
+    reason TEXT,
+    status VARCHAR(20),
+    admin_response TEXT,
+    reserved_quantity INT NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL,
+    archived_at DATETIME,
+    PRIMARY KEY (id, created_at),
+    INDEX idx_request_archive_created (created_at),
+    INDEX idx_request_archive_employee (employee_id)
+)
+PARTITION BY RANGE (TO_DAYS(created_at)) (
+    PARTITION p202501 VALUES LESS THAN (TO_DAYS('2025-02-01')),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+
+CREATE TABLE IF NOT EXISTS supplier_order_archive (
+    id INT NOT NULL,
+    item_id INT NOT NULL,
+    quantity INT NOT NULL,
+    supplier_id INT NOT NULL,
+    status VARCHAR(20),
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME,
+    archived_at DATETIME,
+    PRIMARY KEY (id, created_at),
+    INDEX idx_supplier_archive_created (created_at),
+    INDEX idx_supplier_archive_supplier (supplier_id)
+)
+PARTITION BY RANGE (TO_DAYS(created_at)) (
+    PARTITION p202501 VALUES LESS THAN (TO_DAYS('2025-02-01')),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+
+-- Refresh tokens (sha256 of the opaque token; single use, rotated on refresh)
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    token_hash VARCHAR(64) NOT NULL UNIQUE,
+    expires_at DATETIME NOT NULL,
+    revoked_at DATETIME,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_refresh_tokens_user (user_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Multi-item carts (POST /requests/cart); a retry with the same Idempotency-Key maps to the same cart
+CREATE TABLE IF NOT EXISTS request_carts (
+    id VARCHAR(32) PRIMARY KEY,
+    employee_id INT NOT NULL,
+    idempotency_key VARCHAR(100),
+    request_hash VARCHAR(64) NOT NULL,
+    line_count INT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_cart_idempotency_key (employee_id, idempotency_key),
+    FOREIGN KEY (employee_id) REFERENCES users(id) ON DELETE CASCADE
+);
+ALTER TABLE employee_request ADD COLUMN cart_id VARCHAR(32) NULL,
+    ADD INDEX ix_employee_request_cart_id (cart_id),
+    ADD FOREIGN KEY (cart_id) REFERENCES request_carts(id) ON DELETE SET NULL;
+ALTER TABLE employee_request_archive ADD COLUMN cart_id VARCHAR(32) NULL;
+
+-- Orders created together by POST /supplier-orders/batch share a batch_id
+ALTER TABLE supplier_order ADD COLUMN batch_id VARCHAR(32) NULL, ADD INDEX ix_supplier_order_batch_id (batch_id);
+ALTER TABLE supplier_order_archive ADD COLUMN batch_id VARCHAR(32) NULL;
@@ -11,8 +11,36 @@ document.addEventListener("DOMContentLoaded", () => {
     displayRequests();
     loadAllOrders();
     fetchAndDisplayItems(); // New: Show inventory
+    subscribeToChanges(token);
+    document.getElementById("logoutBtn").addEventListener("click", logout);
 });
 
+// 🔹 Live updates: reload a table only when the server says something in it changed
+function subscribeToChanges(token) {
+    if (!window.EventSource) return;
+    const source = new EventSource(`${API_URL}/events?token=${encodeURIComponent(token)}`);
+    const pending = new Set();
+    let timer = null;
+
+    // Coalesce bursts (e.g. batch approvals) into one reload per table
+    const schedule = (...loaders) => {
+        loaders.forEach(loader => pending.add(loader));
+        if (timer) return;
+        timer = setTimeout(() => {
+            timer = null;
+            pending.forEach(loader => loader());
+            pending.clear();
+        }, 500);
+    };
+
+    ["request.created", "request.approved", "request.rejected", "requests.cleared"].forEach(type =>
+        source.addEventListener(type, () => schedule(displayRequests, loadAllOrders)));
+    ["stock.changed", "inventory.bulk_changed"].forEach(type =>
+        source.addEventListener(type, () => schedule(fetchAndDisplayItems, displayRequests)));
+    source.addEventListener("reset", () => schedule(displayRequests, loadAllOrders, fetchAndDisplayItems));
+    reopenWhenClosed(source, API_URL, subscribeToChanges);
+}
+
 // 🔹 Upload Inventory File (Excel)
 async function uploadInventory() {
     const fileInput = document.getElementById("inventoryFile");
@@ -28,7 +56,7 @@ async function uploadInventory() {
 
     try {
         status.textContent = "Uploading...";
-        const response = await fetch(`${API_URL}/upload-inventory`, {
+        const response = await authFetch(`${API_URL}/upload-inventory`, {
             method: "POST",
             headers: { "Authorization": `Bearer ${token}` },
             body: formData
@@ -36,8 +64,8 @@ async function uploadInventory() {
 
         const result = await response.json();
         if (response.ok) {
-            status.textContent = "✅ Inventory uploaded successfully!";
-            fetchAndDisplayItems(); // Refresh inventory
+            status.textContent = "⏳ Importing...";
+            await waitForImportJob(result.job.id, status);
         } else {
             status.textContent = `❌ Error: ${result.message || "Failed to upload."}`;
         }
@@ -47,6 +75,34 @@ async function uploadInventory() {
     }
 }
 
+// 🔹 Poll a background import job until it finishes
+async function waitForImportJob(jobId, status) {
+    const token = localStorage.getItem("token");
+
+    while (true) {
+        const response = await authFetch(`${API_URL}/jobs/${jobId}`, {
+            headers: { "Authorization": `Bearer ${token}` }
+        });
+        const job = await response.json();
+        if (!response.ok) throw new Error(job.message || "Failed to fetch import status");
+
+        if (job.status === "completed") {
+            status.textContent = job.error_count
+                ? `✅ Inventory uploaded (${job.error_count} invalid rows skipped)`
+                : "✅ Inventory uploaded successfully!";
+            fetchAndDisplayItems(); // Refresh inventory
+            return;
+        }
+        if (job.status === "failed") {
+            status.textContent = `❌ Error: ${job.message || "Import failed."}`;
+            return;
+        }
+
+        status.textContent = `⏳ Importing... ${job.rows_parsed} rows read`;
+        await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+}
+
 // 🔹 Fetch and Display Items (New)
 async function fetchAndDisplayItems() {
     const container = document.getElementById("itemsContainer");
@@ -55,7 +111,7 @@ async function fetchAndDisplayItems() {
     const token = localStorage.getItem("token");
     try {
         container.innerHTML = "<p>Loading items...</p>";
-        const response = await fetch(`${API_URL}/items?page=1`, {
+        const response = await authFetch(`${API_URL}/items?page=1`, {
             headers: { "Authorization": `Bearer ${token}` }
         });
         if (!response.ok) throw new Error("Failed to load items");
@@ -87,7 +143,7 @@ async function fetchAndDisplayItems() {
 async function fetchSuppliers() {
     const token = localStorage.getItem("token");
     try {
-        const response = await fetch(`${API_URL}/users?role=supplier`, {
+        const response = await authFetch(`${API_URL}/users?role=supplier`, {
             headers: { "Authorization": `Bearer ${token}` }
         });
         if (!response.ok) {
@@ -128,7 +184,7 @@ async function placeSupplierOrder(itemId, itemName) {
     const supplier = suppliers[0];  // Use first supplier (add dropdown later)
 
     try {
-        const response = await fetch(`${API_URL}/supplier-orders`, {
+        const response = await authFetch(`${API_URL}/supplier-orders`, {
             method: "POST",
             headers: {
                 "Content-Type": "application/json",
@@ -154,12 +210,14 @@ async function placeSupplierOrder(itemId, itemName) {
     }
 }
 // 🔹 Display All Requests for Admin (Updated with Stock)
-async function displayRequests() {
+let requestsCursor = null;
+
+async function displayRequests(more = false) {
     const token = localStorage.getItem("token");
     const tbody = document.getElementById("admin-requests");
 
     try {
-        const response = await fetch(`${API_URL}/admin/requests`, {
+        const response = await authFetch(pageUrl(`${API_URL}/admin/requests`, more && requestsCursor), {
             headers: { 
                 "Authorization": `Bearer ${token}`,
                 "Content-Type": "application/json"
@@ -173,9 +231,10 @@ async function displayRequests() {
         }
 
         const requests = await response.json();
-        tbody.innerHTML = requests.length
-            ? requests.map(req => `
+        requestsCursor = response.headers.get("X-Next-Cursor");
+        const rows = requests.map(req => `
                 <tr>
+                    <td>${req.status === "pending" ? `<input type="checkbox" class="request-select" value="${req.id}">` : ""}</td>
                     <td>${req.employee_name}</td>
                     <td>${req.item_name}</td>
                     <td>${req.quantity}</td>
@@ -183,68 +242,93 @@ async function displayRequests() {
                     <td class="${req.status.toLowerCase()}">${req.status}</td>
                     <td>
                         ${req.status === "pending" ? `
-                            <button onclick="updateRequest('${req.id}', 'approved')" 
+                            <button onclick="updateRequest(${req.id}, 'approved')" 
                                     class="bg-green-500 hover:bg-green-700 text-white font-bold py-1 px-3 rounded mr-2">
                                 Approve
                             </button>
-                            <button onclick="updateRequest('${req.id}', 'rejected')"
+                            <button onclick="updateRequest(${req.id}, 'rejected')"
                                     class="bg-red-500 hover:bg-red-700 text-white font-bold py-1 px-3 rounded">
                                 Reject
                             </button>
                         ` : req.status}
                     </td>
                 </tr>
-            `).join("")
-            : "<tr><td colspan='6'>No requests found</td></tr>";
+            `).join("");
+        if (more) tbody.insertAdjacentHTML("beforeend", rows);
+        else tbody.innerHTML = rows || "<tr><td colspan='7'>No requests found</td></tr>";
+        showLoadMore("moreRequestsBtn", requestsCursor, () => displayRequests(true));
 
     } catch (error) {
         console.error("❌ Error fetching requests:", error);
-        tbody.innerHTML = "<tr><td colspan='6'>Error loading requests</td></tr>";
+        tbody.innerHTML = "<tr><td colspan='7'>Error loading requests</td></tr>";
     }
 }
 
-// 🔹 Update Request Status
+// 🔹 Update Request Status (one or many decisions in a single batch call)
 async function updateRequest(requestId, status) {
+    await decideRequests([requestId], status);
+}
+
+function toggleAllRequests(checked) {
+    document.querySelectorAll(".request-select").forEach(box => { box.checked = checked; });
+}
+
+async function decideSelectedRequests(status) {
+    const ids = Array.from(document.querySelectorAll(".request-select:checked")).map(box => parseInt(box.value));
+    if (!ids.length) {
+        alert("Select at least one pending request.");
+        return;
+    }
+    await decideRequests(ids, status);
+}
+
+async function decideRequests(ids, status) {
     const token = localStorage.getItem("token");
 
     try {
-        const response = await fetch(`${API_URL}/requests/${requestId}`, {
+        const response = await authFetch(`${API_URL}/requests/batch`, {
             method: "PATCH",
             headers: {
                 "Content-Type": "application/json",
                 "Authorization": `Bearer ${token}`
             },
-            body: JSON.stringify({ status })
+            body: JSON.stringify({ ids, status })
         });
 
-        if (!response.ok) {
-            const errorData = await response.json();
-            throw new Error(errorData.message || "Failed to update request");
-        }
+        const result = await response.json();
+        if (!response.ok) throw new Error(result.message || "Failed to update requests");
 
-        alert("Request updated.");
+        const failures = result.results.filter(r => !r.ok).map(r => `#${r.id}: ${r.error}`);
+        if (failures.length) {
+            alert(`${result.succeeded} updated, ${result.failed} failed:\n${failures.join("\n")}`);
+        } else {
+            alert(ids.length === 1 ? "Request updated." : `${result.succeeded} requests updated.`);
+        }
+        document.getElementById("selectAllRequests").checked = false;
         await displayRequests();
     } catch (error) {
-        console.error("❌ Error updating request:", error);
+        console.error("❌ Error updating requests:", error);
         alert("Failed to update request: " + error.message);
     }
 }
 
 // 🔹 Load All Orders
-async function loadAllOrders() {
+let ordersCursor = null;
+
+async function loadAllOrders(more = false) {
     const token = localStorage.getItem("token");
     const tbody = document.querySelector("#allOrdersTable tbody");
 
     try {
-        const response = await fetch(`${API_URL}/admin/orders`, {
+        const response = await authFetch(pageUrl(`${API_URL}/admin/orders`, more && ordersCursor), {
             headers: { "Authorization": `Bearer ${token}` }
         });
 
         if (!response.ok) throw new Error("Failed to fetch orders");
 
         const orders = await response.json();
-        tbody.innerHTML = orders.length
-            ? orders.map(order => `
+        ordersCursor = response.headers.get("X-Next-Cursor");
+        const rows = orders.map(order => `
                 <tr>
                     <td>${order.employee_name}</td>
                     <td>${order.item_name}</td>
@@ -252,8 +336,10 @@ async function loadAllOrders() {
                     <td class="status-${order.status.toLowerCase()}">${order.status}</td>
                     <td>${new Date(order.created_at).toLocaleDateString()}</td>
                 </tr>
-            `).join("")
-            : `<tr><td colspan="5">No orders found</td></tr>`;
+            `).join("");
+        if (more) tbody.insertAdjacentHTML("beforeend", rows);
+        else tbody.innerHTML = rows || `<tr><td colspan="5">No orders found</td></tr>`;
+        showLoadMore("moreOrdersBtn", ordersCursor, () => loadAllOrders(true));
     } catch (error) {
         console.error("❌ Failed to load orders:", error);
         tbody.innerHTML = `<tr><td colspan="5" class="error">Error loading orders</td></tr>`;
@@ -263,7 +349,7 @@ async function loadAllOrders() {
 // 🔹 Export All Orders to Excel
 async function exportAllOrders() {
     try {
-        const response = await fetch(`${API_URL}/admin/orders/export`, {
+        const response = await authFetch(`${API_URL}/admin/orders/export`, {
             headers: { "Authorization": `Bearer ${localStorage.getItem("token")}` }
         });
 
@@ -297,9 +383,7 @@ function refreshRequests() {
 
 // 🔹 Logout
 function logout() {
-    localStorage.removeItem("token");
-    localStorage.removeItem("role");
-    window.location.href = "/frontend/index.html";
+    endSession(API_URL);
 }
 
 // 🔹 Attach to Window for Global Access (Temporary; refactor later)
@@ -0,0 +1,124 @@
+// Shared by the dashboards: authenticated fetch with token refresh, list paging,
+// and logout. Load it before the page script.
+
+let refreshing = null;
+
+// 🔹 fetch() with the stored access token; on a 401 the refresh token is
+// exchanged once (POST /token/refresh) and the call retried with the new token
+async function authFetch(url, options = {}) {
+    const token = localStorage.getItem("token");
+    const response = await fetch(url, withToken(options, token));
+    if (response.status !== 401) return response;
+
+    // Another tab (or a concurrent call) may already have refreshed
+    if (localStorage.getItem("token") === token && !(await refreshAccessToken(url))) {
+        clearSession();
+        window.location.href = "/frontend/index.html";
+        return response;
+    }
+    return fetch(url, withToken(options, localStorage.getItem("token")));
+}
+
+// Credentials included so the API's read-your-writes cookie comes back with later reads
+function withToken(options, token) {
+    const headers = new Headers(options.headers || {});
+    if (token) headers.set("Authorization", `Bearer ${token}`);
+    return { credentials: "include", ...options, headers };
+}
+
+// 🔹 One exchange at a time: refresh tokens are single use, so concurrent
+// 401s wait for the same refresh instead of each spending the token. Tabs
+// share the token too: the "token-refresh" lock lets one tab exchange it and
+// the others pick up what it stored (the server also tolerates a near miss).
+function refreshAccessToken(baseUrl) {
+    if (!refreshing) {
+        const spent = localStorage.getItem("refresh_token");
+        const exchange = () => localStorage.getItem("refresh_token") !== spent
+            ? Promise.resolve(Boolean(localStorage.getItem("refresh_token")))
+            : exchangeRefreshToken(new URL("/token/refresh", baseUrl));
+        refreshing = (navigator.locks ? navigator.locks.request("token-refresh", exchange) : exchange()).finally(() => {
+            refreshing = null;
+        });
+    }
+    return refreshing;
+}
+
+async function exchangeRefreshToken(refreshUrl) {
+    const refreshToken = localStorage.getItem("refresh_token");
+    if (!refreshToken) return false;
+    try {
+        const response = await fetch(refreshUrl, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ refresh_token: refreshToken })
+        });
+        if (!response.ok) return false;
+        const data = await response.json();
+        localStorage.setItem("token", data.token);
+        localStorage.setItem("refresh_token", data.refresh_token);
+        return true;
+    } catch (error) {
+        console.error("❌ Token refresh failed:", error);
+        return false;
+    }
+}
+
+function accessTokenExpired() {
+    const token = localStorage.getItem("token");
+    try {
+        const claims = JSON.parse(atob(token.split(".")[1].replace(/-/g, "+").replace(/_/g, "/")));
+        return claims.exp * 1000 <= Date.now();
+    } catch (error) {
+        return true;
+    }
+}
+
+// 🔹 EventSource can't send headers or report a 401: a rejected token closes
+// the stream for good, so refresh an expired token and open a new stream
+function reopenWhenClosed(source, baseUrl, reopen) {
+    source.addEventListener("error", async () => {
+        if (source.readyState !== EventSource.CLOSED) return;
+        if (accessTokenExpired() && !(await refreshAccessToken(baseUrl))) return;
+        setTimeout(() => reopen(localStorage.getItem("token")), 5000);
+    });
+}
+
+// 🔹 Lists come back a page at a time; X-Next-Cursor (absent on the last
+// page) is passed back as ?cursor= to fetch the next one
+function pageUrl(url, cursor) {
+    const paged = new URL(url);
+    if (cursor) paged.searchParams.set("cursor", cursor);
+    return paged;
+}
+
+function showLoadMore(buttonId, cursor, loadMore) {
+    const button = document.getElementById(buttonId);
+    if (!button) return;
+    button.hidden = !cursor;
+    button.onclick = loadMore;
+}
+
+// 🔹 Logout: revoke the refresh token on the server, then forget the session
+async function endSession(baseUrl) {
+    const refreshToken = localStorage.getItem("refresh_token");
+    if (refreshToken) {
+        try {
+            await fetch(new URL("/logout", baseUrl), {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ refresh_token: refreshToken }),
+                keepalive: true
+            });
+        } catch (error) {
+            console.error("❌ Logout request failed:", error);
+        }
+    }
+    clearSession();
+    window.location.href = "/frontend/index.html";
+}
+
+function clearSession() {
+    localStorage.removeItem("token");
+    localStorage.removeItem("refresh_token");
+    localStorage.removeItem("role");
+}
@@ -12,8 +12,36 @@ document.addEventListener("DOMContentLoaded", () => {
     fetchItems();
     displayEmployeeRequests(); 
     loadOrderHistory(); // Ensure employee requests are displayed after page load
+    subscribeToChanges(token);
 });
 
+// 🔹 Live updates: reload a list only when the server says something in it changed
+function subscribeToChanges(token) {
+    if (!window.EventSource) return;
+    const source = new EventSource(`${API_URL}/events?token=${encodeURIComponent(token)}`);
+    const pending = new Set();
+    let timer = null;
+
+    // Coalesce bursts (e.g. a cart of several lines) into one reload per list
+    const schedule = (...loaders) => {
+        loaders.forEach(loader => pending.add(loader));
+        if (timer) return;
+        timer = setTimeout(() => {
+            timer = null;
+            pending.forEach(loader => loader());
+            pending.clear();
+        }, 500);
+    };
+
+    // Request events reach only the employee who made the request
+    ["request.created", "request.approved", "request.rejected", "requests.cleared"].forEach(type =>
+        source.addEventListener(type, () => schedule(displayEmployeeRequests, loadOrderHistory)));
+    ["stock.changed", "inventory.bulk_changed"].forEach(type =>
+        source.addEventListener(type, () => schedule(fetchAndDisplayItems)));
+    source.addEventListener("reset", () => schedule(fetchAndDisplayItems, displayEmployeeRequests, loadOrderHistory));
+    reopenWhenClosed(source, API_URL, subscribeToChanges);
+}
+
 // 🔹 Fetch & Display Items
 async function fetchItems() {
     currentSearch = '';
@@ -56,7 +84,7 @@ async function submitRequest(event) {
     const requestData = { item_id: itemId, quantity, reason };
 
     try {
-        const response = await fetch(`${API_URL}/requests`, {
+        const response = await authFetch(`${API_URL}/requests`, {
             method: "POST",
             headers: {
                 "Content-Type": "application/json",
@@ -81,29 +109,116 @@ async function submitRequest(event) {
     }
 }
 
+// 🔹 Cart (many items in one request)
+let cart = [];
+// Kept until the cart is placed, so a retried submit can't place it twice
+let cartKey = null;
+
+function addToCart() {
+    const itemId = parseInt(document.getElementById("selectedItemId").value);
+    const name = document.getElementById("selectedItemName").value;
+    const quantity = parseInt(document.getElementById("quantity").value);
+    const reason = document.getElementById("reason").value;
+
+    if (!itemId || !(quantity > 0)) {
+        alert("Please select an item and a positive quantity.");
+        return;
+    }
+
+    const existing = cart.find(line => line.item_id === itemId);
+    if (existing) {
+        existing.quantity = quantity;
+        existing.reason = reason;
+    } else {
+        cart.push({ item_id: itemId, name, quantity, reason });
+    }
+    cartKey = null;
+    document.getElementById("requestForm").reset();
+    closeModal();
+    renderCart();
+}
+
+function removeFromCart(itemId) {
+    cart = cart.filter(line => line.item_id !== itemId);
+    cartKey = null;
+    renderCart();
+}
+
+function renderCart() {
+    document.getElementById("cartSection").style.display = cart.length ? "block" : "none";
+    document.getElementById("cartItems").innerHTML = cart.map(line => `
+        <tr>
+            <td>${line.name}</td>
+            <td>${line.quantity}</td>
+            <td>${line.reason || ""}</td>
+            <td><button onclick="removeFromCart(${line.item_id})">Remove</button></td>
+        </tr>
+    `).join("");
+}
+
+async function submitCart() {
+    if (!cart.length) return;
+    const token = localStorage.getItem("token");
+    cartKey = cartKey || `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
+    try {
+        const response = await authFetch(`${API_URL}/requests/cart`, {
+            method: "POST",
+            headers: {
+                "Content-Type": "application/json",
+                "Authorization": `Bearer ${token}`,
+                "Idempotency-Key": cartKey
+            },
+            body: JSON.stringify({
+                items: cart.map(({ item_id, quantity, reason }) => ({ item_id, quantity, reason }))
+            })
+        });
+
+        const result = await response.json();
+        if (!response.ok) {
+            const details = (result.errors || []).map(e => `${e.item_id ?? ""} ${e.error}`).join("\n");
+            throw new Error(`${result.error || "Cart could not be placed"}\n${details}`);
+        }
+
+        alert(`✅ ${result.message}`);
+        cart = [];
+        cartKey = null;
+        renderCart();
+        displayEmployeeRequests();
+
+    } catch (error) {
+        console.error("❌ Error submitting cart:", error);
+        alert(error.message);
+    }
+}
+
 // 🔹 Display Employee Requests
-async function displayEmployeeRequests() {
+let requestsCursor = null;
+
+async function displayEmployeeRequests(more = false) {
     const token = localStorage.getItem("token");
     const requestContainer = document.getElementById("my-requests");
 
     try {
-        const response = await fetch(`${API_URL}/requests`, {
+        const response = await authFetch(pageUrl(`${API_URL}/requests`, more && requestsCursor), {
             headers: { "Authorization": `Bearer ${token}` }
         });
 
         if (!response.ok) throw new Error("Error fetching requests.");
 
         const requests = await response.json();
-        requestContainer.innerHTML = requests.length
-            ? requests.map(req => `
+        requestsCursor = response.headers.get("X-Next-Cursor");
+        const rows = requests.map(req => `
                 <tr>
                     <td>${req.item_name || "Unknown"}</td>
                     <td>${req.quantity}</td>
                     <td class="${req.status.toLowerCase()}">${req.status}</td>
                     <td>${req.admin_response || "Pending"}</td>
                 </tr>
-            `).join("")
-            : "<tr><td colspan='4'>No requests found</td></tr>";
+            `).join("");
+        if (more) requestContainer.insertAdjacentHTML("beforeend", rows);
+        else requestContainer.innerHTML = rows || "<tr><td colspan='4'>No requests found</td></tr>";
+        showLoadMore("moreRequestsBtn", requestsCursor, () => displayEmployeeRequests(true));
 
     } catch (error) {
         console.error("❌ Error Fetching Employee Requests:", error);
@@ -113,18 +228,14 @@ async function displayEmployeeRequests() {
 
 // 🔹 Logout
 function logout() {
-    // Clear all client-side data
-    localStorage.removeItem("token");
-    localStorage.removeItem("role");
-
     // Clear the UI
     document.getElementById("itemsContainer").innerHTML = "";
     document.getElementById("my-requests").innerHTML = "";
     const orderHistory = document.getElementById("orderHistoryTable");
     if (orderHistory) orderHistory.querySelector("tbody").innerHTML = "";
 
-    // Redirect to login
-    window.location.href = "/frontend/index.html";
+    // Revoke the refresh token, clear client-side data and go back to login
+    endSession(API_URL);
 }
 
 // 🔹 Form Submit Handler
@@ -138,7 +249,7 @@ async function fetchAndDisplayItems() {
     try {
         container.innerHTML = "<p>Loading items...</p>";
 
-        const response = await fetch(
+        const response = await authFetch(
             `${API_URL}/items?search=${encodeURIComponent(currentSearch)}&page=${currentPage}`,
             { headers: { "Authorization": `Bearer ${token}` } }
         );
@@ -206,7 +317,7 @@ function changePage(newPage) {
 // 🔹 Display Order History (Employee Orders)
 async function showOrderHistory() {
     try {
-        const response = await fetch(`${API_URL}/employee/orders`, {
+        const response = await authFetch(`${API_URL}/employee/orders`, {
             headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
         });
         const orders = await response.json();
@@ -260,7 +371,7 @@ async function loadOrderHistory() {
     }
 
     try {
-        const response = await fetch(`${API_URL}/employee/orders`, {
+        const response = await authFetch(`${API_URL}/employee/orders`, {
             headers: { 
                 'Authorization': `Bearer ${token}`,
                 'Content-Type': 'application/json'
@@ -312,7 +423,7 @@ async function loadOrderHistory() {
 // 🔹 Export Order History to CSV
 async function exportMyOrders() {
     try {
-        const response = await fetch(`${API_URL}/employee/orders/export`, {
+        const response = await authFetch(`${API_URL}/employee/orders/export`, {
             headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
         });
 
@@ -26,6 +26,8 @@ document.getElementById('loginForm').addEventListener('submit', async function(e
         if (response.ok) {
             // Save the token in localStorage or sessionStorage
             localStorage.setItem('token', data.token);
+            // Used to get a new access token when this one expires (POST /token/refresh)
+            localStorage.setItem('refresh_token', data.refresh_token);
             localStorage.setItem('role', data.role);
 
             // Redirect based on role
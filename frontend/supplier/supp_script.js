@@ -7,23 +7,52 @@ document.addEventListener("DOMContentLoaded", () => {
         return;
     }
     fetchSupplierOrders();
+    subscribeToChanges(token);
 });
 
-async function fetchSupplierOrders() {
+// 🔹 Live updates: reload the orders when one of this supplier's orders changes
+function subscribeToChanges(token) {
+    if (!window.EventSource) return;
+    const source = new EventSource(`${API_URL}/events?token=${encodeURIComponent(token)}`);
+    let timer = null;
+
+    // Coalesce bursts (e.g. a batch of status changes) into one reload
+    const schedule = () => {
+        if (timer) return;
+        timer = setTimeout(() => {
+            timer = null;
+            fetchSupplierOrders();
+        }, 500);
+    };
+
+    ["supplier_order.created", "supplier_order.shipped", "supplier_order.delivered", "reset"].forEach(type =>
+        source.addEventListener(type, schedule));
+    reopenWhenClosed(source, API_URL, subscribeToChanges);
+}
+
+// 🔹 Logout
+function logout() {
+    endSession(API_URL);
+}
+
+let ordersCursor = null;
+
+async function fetchSupplierOrders(more = false) {
     const container = document.getElementById("ordersContainer");
     const token = localStorage.getItem("token");
     try {
-        container.innerHTML = "<p>Loading orders...</p>";
-        const response = await fetch(`${API_URL}/supplier-orders`, {
+        if (!more) container.innerHTML = "<p>Loading orders...</p>";
+        const response = await authFetch(pageUrl(`${API_URL}/supplier-orders`, more && ordersCursor), {
             headers: { "Authorization": `Bearer ${token}` }
         });
         if (!response.ok) {
             throw new Error(`Failed to load orders: ${response.status}`);
         }
         const orders = await response.json();
-        container.innerHTML = orders.length
-            ? orders.map(order => `
+        ordersCursor = response.headers.get("X-Next-Cursor");
+        const cards = orders.map(order => `
                 <div class="order-card">
+                    ${order.status !== "delivered" ? `<input type="checkbox" class="order-select" value="${order.id}">` : ""}
                     <p>Item: ${order.item_name}</p>
                     <p>Quantity: ${order.quantity}</p>
                     <p>Status: ${order.status}</p>
@@ -32,8 +61,10 @@ async function fetchSupplierOrders() {
                         <button onclick="updateOrderStatus(${order.id}, 'delivered')">Mark as Delivered</button>
                     ` : ""}
                 </div>
-            `).join("")
-            : "<p>No orders found</p>";
+            `).join("");
+        if (more) container.insertAdjacentHTML("beforeend", cards);
+        else container.innerHTML = cards || "<p>No orders found</p>";
+        showLoadMore("moreOrdersBtn", ordersCursor, () => fetchSupplierOrders(true));
     } catch (error) {
         console.error("Error:", error);
         container.innerHTML = `<p class="error">Failed to load orders: ${error.message}</p>`;
@@ -43,7 +74,7 @@ async function fetchSupplierOrders() {
 async function updateOrderStatus(orderId, status) {
     const token = localStorage.getItem("token");
     try {
-        const response = await fetch(`${API_URL}/supplier-orders/${orderId}`, {
+        const response = await authFetch(`${API_URL}/supplier-orders/${orderId}`, {
             method: "PATCH",
             headers: {
                 "Content-Type": "application/json",
@@ -58,4 +89,37 @@ async function updateOrderStatus(orderId, status) {
         console.error("Error:", error);
         alert(`Error: ${error.message}`);
     }
-}
\ No newline at end of file
+}
+
+// 🔹 Bulk status updates: one request for every selected order
+function toggleAllOrders(checked) {
+    document.querySelectorAll(".order-select").forEach(box => { box.checked = checked; });
+}
+
+async function updateSelectedOrders(status) {
+    const ids = Array.from(document.querySelectorAll(".order-select:checked")).map(box => parseInt(box.value));
+    if (!ids.length) {
+        alert("Select at least one order.");
+        return;
+    }
+    const token = localStorage.getItem("token");
+    try {
+        const response = await authFetch(`${API_URL}/supplier-orders/batch`, {
+            method: "PATCH",
+            headers: {
+                "Content-Type": "application/json",
+                "Authorization": `Bearer ${token}`
+            },
+            body: JSON.stringify({ ids, status })
+        });
+        const result = await response.json();
+        if (!response.ok) throw new Error(result.message || "Failed to update orders");
+        const failures = result.results.filter(r => !r.ok).map(r => `#${r.id}: ${r.error}`);
+        alert(`${result.succeeded} orders marked as ${status}` + (failures.length ? `\n${failures.join("\n")}` : ""));
+        document.getElementById("selectAllOrders").checked = false;
+        fetchSupplierOrders();
+    } catch (error) {
+        console.error("Error:", error);
+        alert(`Error: ${error.message}`);
+    }
+}
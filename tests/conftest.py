@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, BACKEND)
+
+# Verify passwords inline: a login process pool would re-import the test runner
+os.environ.setdefault('LOGIN_WORKERS', '0')
+
+import app as A  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    path = tmp_path_factory.mktemp('db') / 'test.db'
+    app = A.create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'SQLALCHEMY_ENGINE_OPTIONS': {'connect_args': {'timeout': 30}},
+        'RESPONSE_CACHE_BACKEND': 'none',
+        'SEARCH_INDEX_PRELOAD': False,
+        'UPLOAD_FOLDER': str(tmp_path_factory.mktemp('uploads'))
+    })
+    with app.app_context():
+        A.db.create_all()
+        for name, role in (('admin', 'admin'), ('emp', 'employee'), ('supp', 'supplier')):
+            user = A.User(username=name, role=role)
+            user.set_password('pw')
+            A.db.session.add(user)
+        A.db.session.commit()
+    yield app
+    with app.app_context():
+        if A.audit_writer:
+            A.audit_writer.close()
+        A.db.engine.dispose()
+
+
+@pytest.fixture(scope='session')
+def users(app):
+    with app.app_context():
+        return {user.username: user.id for user in A.User.query.all()}
+
+
+@pytest.fixture(scope='session')
+def headers(app):
+    client = app.test_client()
+    tokens = {}
+    for name in ('admin', 'emp', 'supp'):
+        response = client.post('/login', json={'username': name, 'password': 'pw'})
+        tokens[name] = {'Authorization': f"Bearer {response.get_json()['token']}"}
+    return tokens
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
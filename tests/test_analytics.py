@@ -0,0 +1,56 @@
+"""The analytics rebuild must count decisions on the day they were made, like the live rollups."""
+from datetime import datetime, timedelta
+
+import app as A
+
+
+def test_rebuild_counts_decisions_on_the_decision_day(app, client, headers, users):
+    made = datetime.utcnow() - timedelta(days=3)
+    decided = datetime.utcnow()
+    with app.app_context():
+        item = A.Inventory(name='analytics-item', description='d', stock=10)
+        A.db.session.add(item)
+        A.db.session.flush()
+        approved = A.EmployeeRequest(employee_id=users['emp'], item_id=item.id, quantity=2, status='approved', created_at=made)
+        old = A.EmployeeRequest(employee_id=users['emp'], item_id=item.id, quantity=1, status='rejected', created_at=made)
+        A.db.session.add_all([approved, old])
+        A.db.session.flush()
+        # Only the first decision still has its audit row; the other falls back to created_at
+        A.db.session.add(A.AuditLog(table_name='employee_request', record_id=approved.id, action='UPDATE',
+                                    old_values={'status': 'pending'}, new_values={'status': 'approved'}, changed_at=decided))
+        A.db.session.commit()
+        item_id = item.id
+
+    assert client.post('/analytics/rebuild', headers=headers['admin']).status_code == 200
+
+    with app.app_context():
+        days = {row.day: row for row in A.RequestDailyItem.query.filter_by(item_id=item_id)}
+    assert days[made.date()].requests == 2
+    assert days[made.date()].approvals == 0
+    assert days[made.date()].rejections == 1
+    assert days[decided.date()].approvals == 1
+    assert days[decided.date()].approved_qty == 2
+
+
+def test_live_rollups_follow_commits_and_rollbacks(app, client, headers):
+    with app.app_context():
+        item = A.Inventory(name='analytics-live', description='d', stock=10)
+        A.db.session.add(item)
+        A.db.session.commit()
+        item_id = item.id
+    top = client.get('/analytics/items/top', headers=headers['admin'])
+
+    assert client.post('/requests', headers=headers['emp'], json={'item_id': item_id, 'quantity': 2}).status_code == 201
+    with app.app_context():
+        row = A.RequestDailyItem.query.filter_by(item_id=item_id).one()
+        assert (row.requests, row.requested_qty) == (1, 2)
+
+        # A rolled-back write never reaches the rollups
+        A.queue_event(A.db.session, 'request.created', {'id': 0, 'item_id': item_id, 'quantity': 5,
+                                                         'status': 'pending', 'employee_id': 1}, user_id=1)
+        A.db.session.flush()
+        A.db.session.rollback()
+        assert A.RequestDailyItem.query.filter_by(item_id=item_id).one().requests == 1
+
+    # Cached analytics see the new counts
+    assert client.get('/analytics/items/top', headers={**headers['admin'], 'If-None-Match': top.headers['ETag']}).status_code == 200
@@ -0,0 +1,83 @@
+"""Closed rows older than the horizon move to the archive tables and stay listable and countable."""
+from datetime import datetime, timedelta
+
+import app as A
+
+
+def seed(app, users):
+    old = datetime.utcnow() - timedelta(days=400)
+    with app.app_context():
+        item = A.Inventory(name='archive-item', description='d', stock=50)
+        A.db.session.add(item)
+        A.db.session.flush()
+        requests = [
+            A.EmployeeRequest(employee_id=users['emp'], item_id=item.id, quantity=1, status=status, created_at=old)
+            for status in ('approved', 'rejected', 'pending')
+        ]
+        recent = A.EmployeeRequest(employee_id=users['emp'], item_id=item.id, quantity=1, status='approved')
+        orders = [
+            A.SupplierOrder(item_id=item.id, quantity=5, supplier_id=users['supp'], status=status,
+                            created_at=old, updated_at=old)
+            for status in ('delivered', 'pending')
+        ]
+        A.db.session.add_all(requests + [recent] + orders)
+        A.db.session.commit()
+        return item.id, [r.id for r in requests], recent.id, [o.id for o in orders]
+
+
+def ids_in(app, model):
+    with app.app_context():
+        return {row.id for row in A.db.session.query(model.id)}
+
+
+def rollups(app, item_id):
+    with app.app_context():
+        return sorted(
+            (row.day, row.requests, row.approvals, row.rejections)
+            for row in A.RequestDailyItem.query.filter_by(item_id=item_id)
+        )
+
+
+def test_archive_moves_closed_rows_and_lists_them_back(app, client, headers, users):
+    item_id, (approved, rejected, pending), recent, (delivered, open_order) = seed(app, users)
+    assert client.post('/analytics/rebuild', headers=headers['admin']).status_code == 200
+    before = rollups(app, item_id)
+
+    with app.app_context():
+        A.archive_job()
+
+    hot = ids_in(app, A.EmployeeRequest)
+    archived = ids_in(app, A.EmployeeRequestArchive)
+    assert {approved, rejected} <= archived and not {approved, rejected} & hot
+    assert {pending, recent} <= hot and not {pending, recent} & archived
+    assert delivered in ids_in(app, A.SupplierOrderArchive)
+    assert open_order in ids_in(app, A.SupplierOrder)
+
+    # Nothing closed and old is left, so a second run moves nothing
+    with app.app_context():
+        assert A.archive_job() == {'employee_request': 0, 'supplier_order': 0}
+
+    # Hot-only listing no longer sees the archived rows
+    body = client.get(f'/admin/requests?item_id={item_id}', headers=headers['admin']).get_json()
+    assert {row['id'] for row in body} == {pending, recent}
+
+    # include_archived pages over hot and archive rows alike
+    seen, cursor = [], None
+    while True:
+        url = f'/admin/requests?item_id={item_id}&include_archived=1&limit=1'
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''), headers=headers['admin'])
+        assert response.status_code == 200
+        seen += [row['id'] for row in response.get_json()]
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    assert seen == sorted([approved, rejected, pending, recent], reverse=True)
+
+    # So does a date range reaching back past the horizon
+    date_from = (datetime.utcnow() - timedelta(days=500)).strftime('%Y-%m-%d')
+    body = client.get(f'/supplier-orders?item_id={item_id}&date_from={date_from}', headers=headers['admin']).get_json()
+    assert {row['id'] for row in body} == {delivered, open_order}
+
+    # A rebuild after archiving still counts the archived history
+    assert client.post('/analytics/rebuild', headers=headers['admin']).status_code == 200
+    assert rollups(app, item_id) == before
@@ -0,0 +1,88 @@
+"""Refresh tokens rotate, replays end every session, logout revokes, and old hashes are upgraded."""
+from datetime import datetime, timedelta
+
+from werkzeug.security import generate_password_hash
+
+import app as A
+from password_hashing import PasswordVerifier
+
+
+def login(app, client, name, password_hash=None):
+    with app.app_context():
+        user = A.User(username=name, role='employee')
+        user.password_hash = password_hash or generate_password_hash('pw')
+        A.db.session.add(user)
+        A.db.session.commit()
+    response = client.post('/login', json={'username': name, 'password': 'pw'})
+    assert response.status_code == 200
+    return response.get_json()['refresh_token']
+
+
+def refresh(client, token):
+    return client.post('/token/refresh', json={'refresh_token': token})
+
+
+def age_revocations(app):
+    # Push every spent token past the reuse grace window
+    with app.app_context():
+        A.RefreshToken.query.filter(A.RefreshToken.revoked_at.isnot(None)).update(
+            {'revoked_at': datetime.utcnow() - timedelta(hours=1)}, synchronize_session=False
+        )
+        A.db.session.commit()
+
+
+def test_refresh_rotates_the_token(app, client):
+    first = login(app, client, 'auth-rotate')
+    response = refresh(client, first)
+    assert response.status_code == 200
+    second = response.get_json()['refresh_token']
+    assert second != first and response.get_json()['token']
+    assert refresh(client, second).status_code == 200
+
+
+def test_reuse_revokes_every_session_of_the_user(app, client):
+    first = login(app, client, 'auth-reuse')
+    other_session = client.post('/login', json={'username': 'auth-reuse', 'password': 'pw'}).get_json()['refresh_token']
+    second = refresh(client, first).get_json()['refresh_token']
+
+    age_revocations(app)
+    assert refresh(client, first).status_code == 401
+    assert refresh(client, second).status_code == 401
+    assert refresh(client, other_session).status_code == 401
+
+
+def test_concurrent_refresh_within_grace_gets_its_own_pair(app, client):
+    first = login(app, client, 'auth-grace')
+    second = refresh(client, first).get_json()['refresh_token']
+
+    # Another tab spending the same token moments later is not a replay
+    response = refresh(client, first)
+    assert response.status_code == 200
+    assert refresh(client, second).status_code == 200
+    assert refresh(client, response.get_json()['refresh_token']).status_code == 200
+
+    # Once the successor is logged out, the grace is over
+    third = login(app, client, 'auth-grace-logout')
+    fourth = refresh(client, third).get_json()['refresh_token']
+    client.post('/logout', json={'refresh_token': fourth})
+    assert refresh(client, third).status_code == 401
+
+
+def test_logout_revokes_the_refresh_token(app, client):
+    token = login(app, client, 'auth-logout')
+    assert client.post('/logout', json={'refresh_token': token}).status_code == 200
+    assert refresh(client, token).status_code == 401
+
+
+def test_login_rehashes_an_outdated_hash(app, client):
+    login(app, client, 'auth-rehash', password_hash=generate_password_hash('pw', method='pbkdf2:sha256'))
+    with app.app_context():
+        stored = A.User.query.filter_by(username='auth-rehash').one().password_hash
+    assert stored.startswith('scrypt:')
+    assert client.post('/login', json={'username': 'auth-rehash', 'password': 'pw'}).status_code == 200
+
+    verifier = PasswordVerifier(method='scrypt', workers=0)
+    assert verifier.verify(stored, 'pw') == (True, None)
+    assert verifier.verify(stored, 'wrong') == (False, None)
+    matches, new_hash = verifier.verify(generate_password_hash('pw', method='pbkdf2:sha256'), 'pw')
+    assert matches and new_hash.startswith('scrypt:')
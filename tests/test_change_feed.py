@@ -0,0 +1,32 @@
+"""/events must still deliver an event whose id was skipped because its transaction committed late."""
+import json
+
+import app as A
+
+
+def add_event(app, event_id, marker):
+    with app.app_context():
+        A.db.session.add(A.ChangeEvent(id=event_id, event_type='stock.changed', audience='all',
+                                       payload=json.dumps({'marker': marker})))
+        A.db.session.commit()
+
+
+def test_late_commit_below_the_cursor_is_delivered(app, client, headers, monkeypatch):
+    monkeypatch.setitem(app.config, 'CHANGE_FEED_POLL_INTERVAL', 0.05)
+    with app.app_context():
+        latest = A.db.session.query(A.func.max(A.ChangeEvent.id)).scalar() or 0
+    # latest + 1 is still "in flight" when the stream starts
+    add_event(app, latest + 2, 'early')
+
+    response = client.get('/events', headers=headers['emp'], buffered=False)
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b'retry:')
+    assert b'event: ready' in next(chunks)
+
+    add_event(app, latest + 1, 'late')
+    add_event(app, latest + 3, 'next')
+    received = [next(chunks).decode(), next(chunks).decode()]
+    response.close()
+
+    assert 'late' in received[0] and f'id: {latest + 2}\n' in received[0]
+    assert 'next' in received[1] and f'id: {latest + 3}\n' in received[1]
@@ -0,0 +1,33 @@
+"""Table versions are bumped after each committing write and left alone on rollback."""
+import app as A
+
+
+def versions(app):
+    with app.app_context():
+        return dict(A.db.session.query(A.DataVersion.name, A.DataVersion.version).all())
+
+
+def test_commit_bumps_and_rollback_does_not(app):
+    table = A.Inventory.__tablename__
+    before = versions(app).get(table, 0)
+
+    with app.app_context():
+        A.db.session.add(A.Inventory(name='dv-item', description='d', stock=1))
+        A.db.session.commit()
+    assert versions(app)[table] == before + 1
+
+    with app.app_context():
+        A.db.session.add(A.Inventory(name='dv-item-2', description='d', stock=1))
+        A.db.session.flush()
+        A.db.session.rollback()
+    assert versions(app)[table] == before + 1
+
+
+def test_cached_etag_changes_after_write(app, client, headers):
+    first = client.get('/items', headers=headers['emp'])
+    assert client.get('/items', headers={**headers['emp'], 'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    with app.app_context():
+        A.db.session.add(A.Inventory(name='dv-etag', description='d', stock=3))
+        A.db.session.commit()
+    assert client.get('/items', headers=headers['emp']).headers['ETag'] != first.headers['ETag']
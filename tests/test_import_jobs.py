@@ -0,0 +1,57 @@
+"""Import jobs lost with their worker (the pool is in-memory) can be retried and are swept up."""
+import hashlib
+import io
+import time
+from datetime import datetime, timedelta
+
+import app as A
+
+SHEET = b'name,description,stock,low_stock_threshold\nimport-lost,d,7,1\n'
+
+
+def upload(client, headers):
+    data = {'file': (io.BytesIO(SHEET), 'lost.csv')}
+    return client.post('/upload-inventory', headers=headers['admin'], data=data, content_type='multipart/form-data')
+
+
+def wait_for(client, headers, job_id):
+    for _ in range(100):
+        job = client.get(f'/jobs/{job_id}', headers=headers['admin']).get_json()
+        if job['status'] in ('completed', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError('import did not finish')
+
+
+def test_stale_running_job_is_retried_and_swept(app, client, headers, users):
+    old = datetime.utcnow() - timedelta(hours=1)
+    with app.app_context():
+        A.db.session.add_all([
+            # Died mid-run, and never picked up, before a restart
+            A.ImportJob(id='lost-running', file_hash=hashlib.sha256(SHEET).hexdigest(), filename='lost.csv',
+                        stored_path='missing.csv', status='running', user_id=users['admin'],
+                        created_at=old, started_at=old, heartbeat_at=old),
+            A.ImportJob(id='lost-queued', file_hash='0' * 64, filename='queued.csv', stored_path='missing.csv',
+                        status='queued', user_id=users['admin'], created_at=old, heartbeat_at=old),
+            A.ImportJob(id='live-running', file_hash='1' * 64, filename='live.csv', stored_path='missing.csv',
+                        status='running', user_id=users['admin'], created_at=old, heartbeat_at=datetime.utcnow())
+        ])
+        A.db.session.commit()
+
+    # A re-upload of the lost file is not a duplicate: it resumes the job
+    response = upload(client, headers)
+    assert response.status_code == 202
+    assert response.get_json()['job']['id'] == 'lost-running'
+    assert wait_for(client, headers, 'lost-running')['status'] == 'completed'
+    assert upload(client, headers).get_json()['duplicate'] is True
+
+    with app.app_context():
+        assert A.recover_import_jobs() == {'requeued': 1, 'failed': 0}
+    # Requeued and run again (its file is gone, so this attempt fails and can be retried)
+    assert wait_for(client, headers, 'lost-queued')['status'] == 'failed'
+    with app.app_context():
+        assert A.db.session.get(A.ImportJob, 'live-running').status == 'running'
+        A.db.session.get(A.ImportJob, 'live-running').heartbeat_at = old
+        A.db.session.commit()
+        assert A.recover_import_jobs() == {'requeued': 0, 'failed': 1}
+        assert A.db.session.get(A.ImportJob, 'live-running').status == 'failed'
@@ -0,0 +1,34 @@
+"""/metrics is closed by default and exports growing stats as counters."""
+import logging
+
+import app as A
+
+
+def test_metrics_only_answers_local_unproxied_requests(client):
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '10.1.2.3'}).status_code == 403
+    assert client.get('/metrics', headers={'X-Forwarded-For': '10.1.2.3'}).status_code == 403
+
+
+def test_metrics_token_is_required_when_set(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'secret')
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}, environ_base={'REMOTE_ADDR': '10.1.2.3'}).status_code == 200
+
+
+def test_monotonic_stats_are_counters(client, headers):
+    client.get('/items', headers=headers['emp'])
+    body = client.get('/metrics').get_data(as_text=True)
+    assert '# TYPE auth_token_cache_hits_total counter' in body
+    assert '# TYPE db_pool_checkouts_total counter' in body
+    assert '# TYPE login_verifier_verified_total counter' in body
+    assert '# TYPE db_pool_checked_out gauge' in body or '# TYPE db_pool_wait_max_ms gauge' in body
+    assert 'auth_token_cache_hits ' not in body
+
+
+def test_slow_queries_go_to_the_sql_logger(app, caplog):
+    with app.app_context(), caplog.at_level(logging.WARNING, logger='app.sql'):
+        connection = A.db.session.connection()
+        connection.info['query_started'] = [0.0]
+        A.after_sql(connection, None, 'SELECT 1', (), None, False, slow_query_ms=0)
+    assert any(record.name == 'app.sql' and 'Slow query' in record.getMessage() for record in caplog.records)
@@ -0,0 +1,81 @@
+"""The list endpoints must issue a fixed number of statements, however many rows they return."""
+import pytest
+from sqlalchemy import event
+
+import app as A
+from pagination import DEFAULT_LIMIT
+
+LIST_ENDPOINTS = [
+    ('/requests?limit=500', 'emp'),
+    ('/requests?limit=500', 'admin'),
+    ('/admin/requests?limit=500', 'admin'),
+    ('/employee/orders', 'emp'),
+    ('/admin/orders?limit=500', 'admin'),
+]
+
+
+def add_requests(app, employee_id, count):
+    with app.app_context():
+        items = [A.Inventory(name=f'qc-item-{A.Inventory.query.count() + i}', description='d', stock=1000, low_stock_threshold=1)
+                 for i in range(5)]
+        A.db.session.add_all(items)
+        A.db.session.flush()
+        A.db.session.add_all([
+            A.EmployeeRequest(employee_id=employee_id, item_id=items[i % len(items)].id, quantity=1, reason='qc')
+            for i in range(count)
+        ])
+        A.db.session.commit()
+
+
+def count_statements(app, client, url, headers):
+    statements = []
+    with app.app_context():
+        engine = A.db.engine
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return len(response.get_json()), statements
+
+
+@pytest.mark.parametrize('url,who', LIST_ENDPOINTS)
+def test_list_statements_do_not_grow_with_rows(app, client, users, headers, url, who):
+    add_requests(app, users['emp'], 5)
+    # Warm the per-process auth cache so both calls do the same work
+    client.get(url, headers=headers[who])
+    small_rows, small = count_statements(app, client, url, headers[who])
+
+    add_requests(app, users['emp'], 60)
+    large_rows, large = count_statements(app, client, url, headers[who])
+
+    assert large_rows > small_rows
+    assert len(large) == len(small), large
+    # The list itself is one joined SELECT, plus at most a couple of bookkeeping reads
+    assert len(large) <= 3, large
+
+
+def test_lists_are_paged_by_default(app, client, users, headers):
+    add_requests(app, users['emp'], 120)
+    response = client.get('/admin/requests', headers=headers['admin'])
+    assert len(response.get_json()) == DEFAULT_LIMIT
+    assert response.headers['X-Next-Cursor']
+
+    # Following the cursor reaches every row exactly once
+    seen = [row['id'] for row in response.get_json()]
+    cursor = response.headers['X-Next-Cursor']
+    while cursor:
+        response = client.get(f'/admin/requests?cursor={cursor}', headers=headers['admin'])
+        seen += [row['id'] for row in response.get_json()]
+        cursor = response.headers.get('X-Next-Cursor')
+    with app.app_context():
+        assert len(seen) == len(set(seen)) == A.EmployeeRequest.query.count()
+
+    paged = client.get('/admin/requests?limit=50', headers=headers['admin'])
+    assert len(paged.get_json()) == 50
+    assert paged.headers['X-Next-Cursor']
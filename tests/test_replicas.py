@@ -0,0 +1,38 @@
+"""Read-your-writes: a client that just wrote reads from the primary, on any worker."""
+import time
+
+from flask import g
+
+import app as A
+from replicas import WRITE_COOKIE
+
+
+def test_write_cookie_keeps_the_client_on_the_primary(tmp_path):
+    app = A.create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "primary.db"}',
+        'DATABASE_REPLICA_URLS': [f'sqlite:///{tmp_path / "replica.db"}'],
+        'READ_YOUR_WRITES_SECONDS': 10,
+        # create_app() resets the module-level caches; keep them as conftest set them
+        'RESPONSE_CACHE_BACKEND': 'none',
+        'SEARCH_INDEX_PRELOAD': False
+    })
+    with app.app_context():
+        A.db.create_all()
+
+    # A request that wrote sets the cookie; one that only read does not
+    client = app.test_client()
+    assert client.post('/logout', json={'refresh_token': 'unknown'}).status_code == 200
+    assert client.get_cookie(WRITE_COOKIE) is not None
+    assert WRITE_COOKIE not in app.test_client().post('/logout', json={}).headers.get('Set-Cookie', '')
+
+    def replica_for(cookie=None):
+        headers = {'Cookie': f'{WRITE_COOKIE}={cookie}'} if cookie else {}
+        with app.test_request_context(headers=headers):
+            g.db_read_only = True
+            return A.db.session()._choose_replica()
+
+    assert replica_for() is not None
+    assert replica_for(time.time()) is None
+    assert replica_for(time.time() - 60) is not None
+    assert replica_for('garbage') is not None
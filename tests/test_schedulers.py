@@ -0,0 +1,21 @@
+"""Background jobs start from create_app() only when RUN_SCHEDULERS is on."""
+import app as A
+
+
+def started_jobs(monkeypatch, tmp_path, run):
+    started = []
+    monkeypatch.setattr(A, 'start_scheduler', lambda app, name, hours, job: started.append(name))
+    A.create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "s.db"}',
+        # create_app() resets the module-level caches; keep them as conftest set them
+        'RESPONSE_CACHE_BACKEND': 'none',
+        'SEARCH_INDEX_PRELOAD': False,
+        'RUN_SCHEDULERS': run
+    })
+    return started
+
+
+def test_create_app_starts_schedulers_behind_the_flag(monkeypatch, tmp_path):
+    assert started_jobs(monkeypatch, tmp_path, False) == []
+    assert started_jobs(monkeypatch, tmp_path, True) == ['forecast', 'audit-retention', 'archive', 'import-recovery']
@@ -0,0 +1,31 @@
+"""Item search: true hit totals past MAX_RESULTS and the ILIKE fallback for short queries."""
+import app as A
+from search_index import MAX_RESULTS, SearchIndex
+
+
+def test_total_counts_every_match_past_max_results():
+    index = SearchIndex()
+    index.add_many((i, f'widget {i}', None) for i in range(1, MAX_RESULTS + 251))
+    index.mark_synced()
+
+    ranked, total = index.search('widget', limit=16, with_total=True)
+    assert total == MAX_RESULTS + 250
+    assert len(ranked) == 16
+    assert len(index.search('widget', limit=MAX_RESULTS + 500)) == MAX_RESULTS + 250
+
+
+def test_items_search_pages_and_short_queries(app, client, headers):
+    with app.app_context():
+        A.db.session.add_all([A.Inventory(name=f'searchbox {i}', description='d', stock=1) for i in range(1, 21)])
+        A.db.session.add(A.Inventory(name='oxbow', description='d', stock=1))
+        A.db.session.commit()
+
+    body = client.get('/items?search=searchbox&page=3', headers=headers['emp']).get_json()
+    assert body['total_pages'] == 3
+    assert len(body['items']) == 4
+
+    # Too short for a trigram: 'xb' is only a substring, which ILIKE still finds
+    body = client.get('/items?search=xb', headers=headers['emp']).get_json()
+    assert [item['name'] for item in body['items']] == ['oxbow']
+    hits = client.get('/items/typeahead?q=xb', headers=headers['emp']).get_json()
+    assert [hit['name'] for hit in hits] == ['oxbow']
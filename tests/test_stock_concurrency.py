@@ -0,0 +1,86 @@
+"""Concurrent approvals and reservations against one item must never oversell it."""
+import threading
+
+from sqlalchemy import func
+
+import app as A
+
+START_STOCK = 50
+
+
+def test_concurrent_approvals_and_reservations_balance(app, users, headers):
+    with app.app_context():
+        item = A.Inventory(name='stress-item', description='d', stock=START_STOCK, low_stock_threshold=1)
+        A.db.session.add(item)
+        A.db.session.flush()
+        # Requests placed without a reservation: approving them takes free stock directly
+        backlog = [A.EmployeeRequest(employee_id=users['emp'], item_id=item.id, quantity=2, reason='stress')
+                   for _ in range(20)]
+        A.db.session.add_all(backlog)
+        A.db.session.commit()
+        item_id = item.id
+        backlog_ids = [request.id for request in backlog]
+        engine = A.db.engine
+
+    # Each call with the (stock, reserved) change it makes when it succeeds
+    calls = (
+        [('patch', f'/requests/{request_id}', 'admin', {'status': 'approved'}, (-2, 0)) for request_id in backlog_ids]
+        + [('post', '/requests/cart', 'emp', {'items': [{'item_id': item_id, 'quantity': 3}]}, (0, 3))] * 15
+        + [('post', '/requests', 'emp', {'item_id': item_id, 'quantity': 2}, (0, 2))] * 15
+    )
+    barrier = threading.Barrier(len(calls))
+    outcomes = []
+    violations = []
+    done = threading.Event()
+
+    def worker(method, url, who, body, delta):
+        client = app.test_client()
+        barrier.wait()
+        response = getattr(client, method)(url, json=body, headers=headers[who])
+        outcomes.append((response.status_code, delta))
+
+    def sampler():
+        # Watch the row from outside the app while the workers run
+        while not done.is_set():
+            with engine.connect() as connection:
+                stock, reserved = connection.execute(
+                    A.Inventory.__table__.select().with_only_columns(
+                        A.Inventory.stock, A.Inventory.reserved
+                    ).where(A.Inventory.id == item_id)
+                ).one()
+            if stock < 0 or reserved < 0 or reserved > stock:
+                violations.append((stock, reserved))
+
+    watcher = threading.Thread(target=sampler)
+    watcher.start()
+    threads = [threading.Thread(target=worker, args=call) for call in calls]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    watcher.join()
+
+    assert not violations
+    # Calls either succeed or are turned away for lack of stock; none may error
+    assert {status for status, _ in outcomes} <= {200, 201, 400}
+    succeeded = [delta for status, delta in outcomes if status in (200, 201)]
+    assert succeeded
+    # Demand (40 approved + 45 + 30 reserved) exceeds the 50 units: some must be refused
+    assert len(succeeded) < len(calls)
+    expected_stock = START_STOCK + sum(d_stock for d_stock, _ in succeeded)
+    expected_reserved = sum(d_reserved for _, d_reserved in succeeded)
+
+    with app.app_context():
+        A.db.session.expire_all()
+        item = A.db.session.get(A.Inventory, item_id)
+        taken = A.db.session.query(func.coalesce(func.sum(A.EmployeeRequest.quantity), 0)).filter(
+            A.EmployeeRequest.item_id == item_id, A.EmployeeRequest.status == 'approved'
+        ).scalar()
+        held = A.db.session.query(func.coalesce(func.sum(A.EmployeeRequest.reserved_quantity), 0)).filter(
+            A.EmployeeRequest.item_id == item_id, A.EmployeeRequest.status == 'pending'
+        ).scalar()
+        assert (item.stock, item.reserved) == (expected_stock, expected_reserved)
+        assert 0 <= item.reserved <= item.stock
+        assert item.stock == START_STOCK - taken
+        assert item.reserved == held
@@ -0,0 +1,19 @@
+"""Supplier-order batches reject malformed input with a 400, never a 500."""
+
+
+def test_ids_shorthand_must_be_a_list(client, headers):
+    response = client.patch('/supplier-orders/batch', headers=headers['supp'], json={'ids': 5, 'status': 'shipped'})
+    assert response.status_code == 400
+
+    response = client.patch('/supplier-orders/batch', headers=headers['supp'], json={'ids': [True], 'status': 'shipped'})
+    assert response.get_json()['results'][0]['error'] == 'Invalid order id'
+
+
+def test_bools_are_not_ids(client, headers, users):
+    orders = [
+        {'item_id': True, 'supplier_id': users['supp'], 'quantity': 1},
+        {'item_id': 1, 'supplier_id': True, 'quantity': 1}
+    ]
+    response = client.post('/supplier-orders/batch', headers=headers['admin'], json={'orders': orders})
+    assert response.status_code == 400
+    assert [r['error'] for r in response.get_json()['results']] == ['Missing required fields'] * 2